@@ -0,0 +1,95 @@
+"""Generators of synthetic task graphs for the benchmarks.
+
+Every generator returns task data as written by TaskList.dump_data, tasks
+are listed after their dependencies. Statuses are drawn from a seeded random
+generator, so the same arguments give the same tasks.
+"""
+
+import math
+import random
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+TasksDataT = dict[str, dict[str, Any]]
+
+START = datetime(2024, 1, 1)
+# Status of a task and how likely it is
+STATUS_WEIGHTS = {"pending": 5, "in-progress": 1, "done": 3, "cancelled": 1}
+
+
+def task_id(i: int) -> str:
+    return f"task-{i}"
+
+
+def _task(i: int, dependencies: list[int], rng: random.Random) -> dict[str, Any]:
+    created = START + timedelta(minutes=i)
+    status = rng.choices(list(STATUS_WEIGHTS), weights=STATUS_WEIGHTS.values())[0]
+    data: dict[str, Any] = {
+        "id": task_id(i),
+        "message": f"Task number {i}",
+        "status": status,
+        "dependencies": [task_id(j) for j in dependencies],
+        "created": created.isoformat(),
+    }
+    if status in ("in-progress", "done"):
+        data["started"] = (created + timedelta(hours=1)).isoformat()
+    if status == "done":
+        data["completed"] = (created + timedelta(hours=2)).isoformat()
+    return data
+
+
+def _build(count: int, seed: int, deps: Callable[[int], list[int]]) -> TasksDataT:
+    rng = random.Random(seed)
+    return {task_id(i): _task(i, deps(i), rng) for i in range(count)}
+
+
+def chain(count: int, seed: int = 0) -> TasksDataT:
+    """Every task depends on the one before it."""
+    return _build(count, seed, lambda i: [i - 1] if i else [])
+
+
+def fan(count: int, seed: int = 0) -> TasksDataT:
+    """All tasks depend on the first, the last depends on all others."""
+    last = count - 1
+
+    def deps(i: int) -> list[int]:
+        if i == 0:
+            return []
+        if i == last:
+            return list(range(1, last))
+        return [0]
+
+    return _build(count, seed, deps)
+
+
+def lattice(count: int, seed: int = 0) -> TasksDataT:
+    """Rows of tasks, each depending on two neighbours in the row above."""
+    width = max(1, math.isqrt(count))
+
+    def deps(i: int) -> list[int]:
+        row, column = divmod(i, width)
+        if row == 0:
+            return []
+        above = (row - 1) * width
+        return sorted({above + column, above + min(column + 1, width - 1)})
+
+    return _build(count, seed, deps)
+
+
+def random_dag(count: int, seed: int = 0) -> TasksDataT:
+    """Up to three dependencies on random earlier tasks."""
+    rng = random.Random(seed + 1)
+    return _build(
+        count,
+        seed,
+        lambda i: sorted(set(rng.choices(range(i), k=3))) if i else [],
+    )
+
+
+GENERATORS: dict[str, Callable[[int, int], TasksDataT]] = {
+    "chain": chain,
+    "fan": fan,
+    "lattice": lattice,
+    "random": random_dag,
+}
@@ -0,0 +1,43 @@
+"""Memory used per task by a loaded TaskList.
+
+Usage:
+    python benchmarks/memory.py [--tasks N]
+"""
+
+import argparse
+import gc
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from dependent_todos.models import TaskList
+from graphs import random_dag
+
+
+def measure_load(file_path: Path, validate: bool) -> float:
+    """Load the tasks file and return the bytes allocated per task."""
+    gc.collect()
+    tracemalloc.start()
+    tasks = TaskList.load_from_file(file_path, validate=validate)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / len(tasks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = Path(tmp) / "todos.toml"
+        TaskList.write_data(random_dag(args.tasks), file_path)
+        for validate in (True, False):
+            per_task = measure_load(file_path, validate)
+            mode = "validated" if validate else "trusted"
+            print(f"{mode:>9}: {per_task:7.0f} bytes/task")
+
+
+if __name__ == "__main__":
+    main()
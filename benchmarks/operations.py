@@ -0,0 +1,148 @@
+"""How TaskList operations scale with the size and shape of the task graph.
+
+Every operation is timed on tasks loaded from a file written for the graph,
+see graphs.py for the shapes. Results are printed as a table and can be
+written as JSON to compare runs across commits.
+
+Usage:
+    python benchmarks/operations.py [--graphs chain fan] [--sizes 100 1000]
+        [--repeat N] [--output results.json]
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any
+
+from dependent_todos.cache import cache_path
+from dependent_todos.models import TaskList
+from graphs import GENERATORS, task_id
+
+SIZES = (100, 1_000, 10_000, 100_000, 200_000)
+# Limits of the dependency tree, a chain would otherwise give lines as long
+# as the chain
+TREE_MAX_DEPTH = 100
+TREE_MAX_NODES = 10_000
+
+# Name -> (setup returning the argument of the operation, operation)
+OperationsT = dict[str, tuple[Callable[[], Any], Callable[[Any], Any]]]
+
+
+def operations(file_path: Path, count: int) -> OperationsT:
+    """Get the timed operations on a tasks file with count tasks."""
+    first, last = task_id(0), task_id(count - 1)
+
+    def load() -> TaskList:
+        return TaskList.load_from_file(file_path)
+
+    def uncached() -> Path:
+        cache_path(file_path).unlink(missing_ok=True)
+        return file_path
+
+    def all_states(tasks: TaskList) -> None:
+        for task in tasks.values():
+            tasks.get_task_state(task)
+
+    return {
+        "load_from_file": (uncached, TaskList.load_from_file),
+        "load_from_file[cached]": (lambda: file_path, TaskList.load_from_file),
+        "save_to_file": (load, lambda tasks: tasks.save_to_file(file_path)),
+        "get_task_state[all]": (load, all_states),
+        "get_pending_tasks": (load, lambda tasks: tasks.get_pending_tasks()),
+        "topological_sort": (load, lambda tasks: tasks.topological_sort()),
+        # Whether the first task can depend on the last, searches all paths
+        "detect_circular_dependencies": (
+            load,
+            lambda tasks: tasks.detect_circular_dependencies(first, [last]),
+        ),
+        "get_dependency_tree": (
+            load,
+            lambda tasks: tasks.get_dependency_tree(
+                last, max_depth=TREE_MAX_DEPTH, max_nodes=TREE_MAX_NODES
+            ),
+        ),
+    }
+
+
+def measure(setup: Callable[[], Any], operation: Callable[[Any], Any], repeat: int):
+    """Time an operation, each run gets a fresh argument from setup."""
+    times = []
+    for _ in range(repeat):
+        argument = setup()
+        start = time.perf_counter()
+        operation(argument)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            # The commit of the benchmarked code, wherever it is run from
+            cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--graphs", nargs="+", choices=list(GENERATORS), default=list(GENERATORS)
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'graph':<8} {'tasks':>7} {'operation':<30} {'min':>10} {'median':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = Path(tmp) / "todos.toml"
+        for graph in args.graphs:
+            for count in args.sizes:
+                TaskList.write_data(GENERATORS[graph](count, 0), file_path)
+                for name, (setup, operation) in operations(file_path, count).items():
+                    times = measure(setup, operation, args.repeat)
+                    result = {
+                        "graph": graph,
+                        "tasks": count,
+                        "operation": name,
+                        "min_s": min(times),
+                        "median_s": statistics.median(times),
+                        "times_s": times,
+                    }
+                    results.append(result)
+                    print(
+                        f"{graph:<8} {count:>7} {name:<30} "
+                        f"{result['min_s'] * 1000:>8.2f}ms "
+                        f"{result['median_s'] * 1000:>8.2f}ms",
+                        flush=True,
+                    )
+
+    if args.output:
+        report = {
+            "commit": git_commit(),
+            "date": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "results": results,
+        }
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Latency of TUI interactions with growing task lists.
+
+The app runs headless under a Textual pilot, as in the tests. Every
+interaction is a key press, timed until all widgets have processed the
+resulting messages. Unlike Pilot.press, this does not include waiting for
+the process to be idle and for animations. "baseline" is a key without a
+binding and shows the overhead of the harness.
+
+Usage:
+    python benchmarks/ui_latency.py [--sizes 100 1000] [--repeat N]
+        [--table auto|datatable|virtual] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from dependent_todos.models import TaskList
+from dependent_todos.tui import DependentTodosApp
+from graphs import random_dag
+from textual import events
+from textual.pilot import Pilot
+
+SIZES = (100, 1_000, 10_000, 50_000)
+SCREEN_SIZE = (120, 40)
+TABLE_MODES = {"auto": None, "datatable": False, "virtual": True}
+# Rounds of waiting for the widgets to process their messages
+SETTLE_PASSES = 3
+
+
+async def press(pilot: Pilot, key: str) -> float:
+    """Press a key and return the seconds until the app processed it."""
+    app = pilot.app
+    event = events.Key(key, key if len(key) == 1 else None)
+    event.set_sender(app)
+    start = time.perf_counter()
+    app._driver.send_message(event)
+    # Handlers post further messages, e.g. the table to the app
+    for _ in range(SETTLE_PASSES):
+        await pilot._wait_for_screen()
+    elapsed = time.perf_counter() - start
+    # Let timers and repaints settle outside of the measurement
+    await pilot.pause()
+    return elapsed
+
+
+async def measure_app(
+    file_path: Path, repeat: int, virtual_table: bool | None
+) -> dict[str, list[float]]:
+    """Run the interactions on the tasks in a file."""
+    app = DependentTodosApp(config_path=str(file_path), virtual_table=virtual_table)
+    app.animation_level = "none"
+    times: dict[str, list[float]] = {}
+
+    def record(name: str, elapsed: float) -> None:
+        times.setdefault(name, []).append(elapsed)
+
+    async with app.run_test(size=SCREEN_SIZE) as pilot:
+        await pilot.pause()
+        for _ in range(repeat):
+            record("baseline", await press(pilot, "f12"))
+
+        app.filter_tabs.focus()
+        for _ in range(repeat):
+            # Through all tabs, ending on the first one again
+            for _ in app.filter_tabs.query("Tab"):
+                record("tab switch", await press(pilot, "right"))
+
+        # The pending tab has the most rows
+        app.filter_tabs.active = app.filter_tabs.query("Tab")[1].id
+        await pilot.pause()
+        app.task_table.focus()
+        for _ in range(repeat):
+            record("row highlight", await press(pilot, "down"))
+
+        for _ in range(repeat):
+            record("toggle tree (open)", await press(pilot, "t"))
+            record("row highlight (tree)", await press(pilot, "down"))
+            record("toggle tree (close)", await press(pilot, "t"))
+
+        for _ in range(repeat):
+            record("add modal", await press(pilot, "a"))
+            await press(pilot, "escape")
+            record("update modal", await press(pilot, "e"))
+            await press(pilot, "escape")
+
+        for _ in range(repeat):
+            record("mark done", await press(pilot, "m"))
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--table", choices=list(TABLE_MODES), default="auto")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    medians: dict[str, dict[int, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.sizes:
+            file_path = Path(tmp) / f"todos-{count}.toml"
+            TaskList.write_data(random_dag(count), file_path)
+            times = asyncio.run(
+                measure_app(file_path, args.repeat, TABLE_MODES[args.table])
+            )
+            for name, values in times.items():
+                medians.setdefault(name, {})[count] = statistics.median(values)
+
+    print("median ms".ljust(24) + "".join(f"{count:>10}" for count in args.sizes))
+    for name, by_size in medians.items():
+        row = "".join(f"{by_size[count] * 1000:>10.1f}" for count in args.sizes)
+        print(name.ljust(24) + row)
+
+    if args.output:
+        report = {
+            "table": args.table,
+            "repeat": args.repeat,
+            "median_s": {
+                name: {str(count): value for count, value in by_size.items()}
+                for name, by_size in medians.items()
+            },
+        }
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
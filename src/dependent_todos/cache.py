@@ -0,0 +1,114 @@
+"""Binary sidecar cache of parsed task files.
+
+Parsing a large TOML file dominates startup. The parsed data is kept in a
+marshal file next to the tasks file and reused as long as the path,
+modification time and size of the tasks file and the cache schema are
+unchanged. Data dumped from validated tasks is marked as such, so loading
+it can skip validation.
+"""
+
+import marshal
+import os
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from dependent_todos.constants import CACHE_SCHEMA_VERSION
+from dependent_todos.utils import atomic_write, paused_gc
+
+CacheKeyT = tuple[int, str, int, int]
+
+
+class CachedData(NamedTuple):
+    """Data read from the cache of a tasks file."""
+
+    data: dict[str, Any]
+    # Whether data is known to be valid, e.g. because this tool wrote it
+    validated: bool
+
+
+def cache_path(file_path: Path) -> Path:
+    """Get the path of the sidecar cache of a tasks file."""
+    return file_path.with_name(f".{file_path.name}.cache")
+
+
+def cache_key(file_path: Path, stat: os.stat_result | None = None) -> CacheKeyT | None:
+    """Get the key identifying the current content of a tasks file.
+
+    Take the key before reading the file, so a change while reading results
+    in a cache that never matches instead of one with outdated data.
+
+    Args:
+        file_path: Path to the tasks file
+        stat: Status of the file content, e.g. as returned by atomic_write,
+            instead of the current one
+
+    Returns:
+        Schema version, resolved path, modification time and size, or None
+        if the file is missing
+    """
+    if stat is None:
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            return None
+    return (
+        CACHE_SCHEMA_VERSION,
+        str(file_path.resolve()),
+        stat.st_mtime_ns,
+        stat.st_size,
+    )
+
+
+def read_cache(file_path: Path) -> CachedData | None:
+    """Read the cached data of a tasks file.
+
+    Args:
+        file_path: Path to the tasks file
+
+    Returns:
+        The data as parsed from the tasks file, None if there is no cache
+        or it does not match the current file
+    """
+    key = cache_key(file_path)
+    if key is None:
+        return None
+    try:
+        # The data is nested as bytes, so a stale cache is not decoded
+        cached_key, validated, payload = marshal.loads(
+            cache_path(file_path).read_bytes()
+        )
+        if tuple(cached_key) != key:
+            return None
+        with paused_gc():
+            return CachedData(marshal.loads(payload), validated)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def write_cache(
+    file_path: Path,
+    data: dict[str, Any],
+    key: CacheKeyT | None,
+    validated: bool = False,
+) -> None:
+    """Cache the data of a tasks file.
+
+    Failing to write the cache is not an error, the tasks file is parsed
+    again next time. The cache gets the permissions of the tasks file, as
+    it holds the same data.
+
+    Args:
+        file_path: Path to the tasks file
+        data: The data as parsed from the tasks file
+        key: Result of cache_key for the file content data stems from
+        validated: Data was dumped from valid tasks and can be loaded
+            without validation
+    """
+    if key is None:
+        return
+    try:
+        mode = file_path.stat().st_mode & 0o7777
+        payload = marshal.dumps((key, validated, marshal.dumps(data)))
+        atomic_write(cache_path(file_path), payload, durable=False, mode=mode)
+    except (OSError, ValueError):
+        pass
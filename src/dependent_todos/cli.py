@@ -0,0 +1,236 @@
+"""Command line interface for dependent todos.
+
+Subcommands work on the tasks file without starting the TUI and never import
+Textual, so scripts and hooks start quickly. Without a subcommand the TUI is
+started.
+"""
+
+import argparse
+import json
+import sys
+from collections.abc import Iterable
+from graphlib import CycleError
+from typing import Any, get_args
+
+from dependent_todos.config import get_config_path
+from dependent_todos.constants import TODOS_CONFIG_NAME
+from dependent_todos.filters import TabFilters, TabFilterType, filter_ids
+from dependent_todos.models import SortFieldsT, Task, TaskList
+from dependent_todos.storage import Storage, get_storage
+from dependent_todos.utils import generate_unique_id, slugify
+
+# Filter names on the command line, e.g. "ready-todo" for the "Ready TODO" tab
+FILTERS: dict[str, TabFilterType] = {slugify(name): name for name in TabFilters}
+SORT_FIELDS: tuple[SortFieldsT, ...] = get_args(SortFieldsT)
+
+
+def task_data(task: Task, tasks: TaskList) -> dict[str, Any]:
+    """Get the JSON output of a task, including its computed state."""
+    data = task.model_dump(mode="json", exclude_none=True)
+    data["state"] = tasks.get_task_state(task)
+    return data
+
+
+def print_tasks(tasks: TaskList, task_ids: Iterable[str], as_json: bool) -> None:
+    """Print tasks as tab separated id, state and message, or as JSON."""
+    selected = [tasks[task_id] for task_id in task_ids]
+    if as_json:
+        print(json.dumps([task_data(task, tasks) for task in selected], indent=2))
+        return
+    for task in selected:
+        print(f"{task.id}\t{tasks.get_task_state(task)}\t{task.message}")
+
+
+def get_task(tasks: TaskList, task_id: str) -> Task:
+    """Get a task or exit with an error if it does not exist."""
+    task = tasks.get(task_id)
+    if task is None:
+        sys.exit(f"Task '{task_id}' not found")
+    return task
+
+
+def save(storage: Storage, tasks: TaskList) -> None:
+    storage.write(storage.snapshot(tasks))
+
+
+def cmd_list(args: argparse.Namespace, storage: Storage) -> None:
+    tasks = storage.load()
+    task_ids = tasks.sorted_ids(args.sort, reverse=args.reverse)
+    if args.filter != "all":
+        filtered = filter_ids(tasks, FILTERS[args.filter])
+        task_ids = [task_id for task_id in task_ids if task_id in filtered]
+    print_tasks(tasks, task_ids, args.json)
+
+
+def cmd_ready(args: argparse.Namespace, storage: Storage) -> None:
+    tasks = storage.load()
+    print_tasks(tasks, tasks.get_pending_tasks(), args.json)
+
+
+def cmd_order(args: argparse.Namespace, storage: Storage) -> None:
+    tasks = storage.load()
+    try:
+        ordered = tasks.topological_sort()
+    except CycleError as e:
+        sys.exit(f"Error: {e}")
+    print_tasks(tasks, ordered, args.json)
+
+
+def cmd_add(args: argparse.Namespace, storage: Storage) -> None:
+    tasks = storage.load()
+    message = args.message.strip()
+    if not message:
+        sys.exit("Task message cannot be empty")
+    for dep_id in args.depends_on:
+        get_task(tasks, dep_id)
+    task_id = generate_unique_id(message, set(tasks.keys()))
+    circular_deps = tasks.detect_circular_dependencies(task_id, args.depends_on)
+    if circular_deps:
+        sys.exit(f"Circular dependency detected: {' → '.join(circular_deps)}")
+    tasks[task_id] = Task(
+        id=task_id,
+        message=message,
+        dependencies=args.depends_on,
+        status="pending",
+        started=None,
+        completed=None,
+    )
+    save(storage, tasks)
+    print_tasks(tasks, [task_id], args.json)
+
+
+def cmd_done(args: argparse.Namespace, storage: Storage) -> None:
+    tasks = storage.load()
+    get_task(tasks, args.task_id)
+    unblocked = sorted(tasks.mark_done(args.task_id))
+    save(storage, tasks)
+    if args.json:
+        print(json.dumps({"id": args.task_id, "unblocked": unblocked}, indent=2))
+        return
+    print(f"Task '{args.task_id}' marked as done")
+    if unblocked:
+        print(f"Unblocked: {', '.join(unblocked)}")
+
+
+def cmd_cancel(args: argparse.Namespace, storage: Storage) -> None:
+    tasks = storage.load()
+    task = get_task(tasks, args.task_id)
+    if args.undo:
+        # Uncancelling reopens the task, only do that for cancelled ones
+        if not task.cancelled:
+            sys.exit(f"Task '{args.task_id}' is not cancelled")
+        task.cancelled = False
+    else:
+        task.cancelled = True
+    save(storage, tasks)
+    print_tasks(tasks, [args.task_id], args.json)
+
+
+def cmd_tree(args: argparse.Namespace, storage: Storage) -> None:
+    tasks = storage.load()
+    if args.task_id is not None:
+        get_task(tasks, args.task_id)
+        root_ids = [args.task_id]
+    else:
+        graph = tasks.dependency_graph
+        # With cycles there might be no roots, show all tasks then
+        root_ids = sorted(graph.ids[i] for i in graph.roots()) or sorted(tasks.keys())
+    for root_id in root_ids:
+        for line in tasks.iter_dependency_tree(root_id, max_depth=args.max_depth):
+            print(line)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Manage dependent todos, starts the TUI without a command"
+    )
+    parser.add_argument(
+        "--config",
+        type=str,
+        help="Path to configuration file (default: %(default)s)",
+        default=TODOS_CONFIG_NAME,
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Validate all tasks on load, even if the file was written by this tool",
+    )
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--json", action="store_true", help="Print JSON")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    cmd = commands.add_parser("list", parents=[output], help="List tasks")
+    cmd.add_argument(
+        "filter",
+        nargs="?",
+        choices=["all", *FILTERS],
+        default="all",
+        help="Show the tasks of a TUI tab (default: %(default)s)",
+    )
+    cmd.add_argument(
+        "--sort",
+        choices=SORT_FIELDS,
+        default="created",
+        help="Field to sort by (default: %(default)s)",
+    )
+    cmd.add_argument("--reverse", action="store_true", help="Largest values first")
+    cmd.set_defaults(func=cmd_list)
+
+    cmd = commands.add_parser(
+        "ready", parents=[output], help="List tasks ready to work on"
+    )
+    cmd.set_defaults(func=cmd_ready)
+
+    cmd = commands.add_parser(
+        "order", parents=[output], help="List open tasks, dependencies first"
+    )
+    cmd.set_defaults(func=cmd_order)
+
+    cmd = commands.add_parser("add", parents=[output], help="Add a task")
+    cmd.add_argument("message", help="Task message, the id is derived from it")
+    cmd.add_argument(
+        "--depends-on",
+        nargs="+",
+        default=[],
+        metavar="TASK_ID",
+        help="IDs of the tasks the new task depends on",
+    )
+    cmd.set_defaults(func=cmd_add)
+
+    cmd = commands.add_parser("done", parents=[output], help="Mark a task as done")
+    cmd.add_argument("task_id", help="ID of the task")
+    cmd.set_defaults(func=cmd_done)
+
+    cmd = commands.add_parser("cancel", parents=[output], help="Cancel a task")
+    cmd.add_argument("task_id", help="ID of the task")
+    cmd.add_argument("--undo", action="store_true", help="Uncancel the task")
+    cmd.set_defaults(func=cmd_cancel)
+
+    cmd = commands.add_parser("tree", help="Show the dependency tree")
+    cmd.add_argument(
+        "task_id", nargs="?", help="Root task (default: all tasks nothing depends on)"
+    )
+    cmd.add_argument(
+        "--max-depth", type=int, help="Do not expand tasks deeper than this"
+    )
+    cmd.set_defaults(func=cmd_tree)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run a subcommand, or the TUI if none is given."""
+    parser = build_parser()
+    args, _ = parser.parse_known_args(argv)
+    if args.command is None:
+        # Only the TUI needs Textual
+        from dependent_todos.tui import run
+
+        run(argv)
+        return
+    args = parser.parse_args(argv)
+    storage = get_storage(get_config_path(args.config), validate=args.validate)
+    args.func(args, storage)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,12 @@
 
 import os
 from pathlib import Path
-
-from dependent_todos.constants import TODOS_CONFIG_ENV_KEY, TODOS_CONFIG_NAME
+from dependent_todos.constants import (
+    STORAGE_BACKENDS,
+    TODOS_CONFIG_ENV_KEY,
+    TODOS_CONFIG_NAME,
+    StorageBackendT,
+)
 
 
 def get_config_path(config_override: str | None = None) -> Path:
@@ -32,6 +36,18 @@ def get_config_path(config_override: str | None = None) -> Path:
     return Path(p).expanduser().resolve()
 
 
+def get_storage_backend(config_path: Path) -> StorageBackendT:
+    """Get the storage backend for a configuration file from its extension.
+
+    Args:
+        config_path: Path to the config file
+
+    Returns:
+        Name of the storage backend, "toml" for unknown extensions
+    """
+    return STORAGE_BACKENDS.get(config_path.suffix.lower(), "toml")
+
+
 def ensure_config_directory(config_path: Path) -> None:
     """Ensure the configuration directory exists.
 
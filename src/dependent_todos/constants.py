@@ -1,8 +1,23 @@
+from typing import Literal
+
 TASK_ID_MAX_LEN = 30
 TASK_ID_RE_PATT = r"^[a-z0-9]+(?:-[a-z0-9]+)*$"
 TODOS_CONFIG_ENV_KEY = "TODOS_CONFIG"
 TODOS_CONFIG_NAME = "./todos.toml"
 
+StorageBackendT = Literal["toml", "journal", "sqlite"]
+# Storage backend by config file extension, anything else is stored as TOML
+STORAGE_BACKENDS: dict[str, StorageBackendT] = {
+    ".toml": "toml",
+    ".journal": "journal",
+    ".db": "sqlite",
+    ".sqlite": "sqlite",
+}
+# Compact a journal once it is larger than its snapshot and at least this big
+JOURNAL_COMPACT_MIN_BYTES = 64 * 1024
+# Bump when the data stored in the sidecar cache of a tasks file changes
+CACHE_SCHEMA_VERSION = 1
+
 # Color mapping for task states
 
 MAX_MESSAGE_DISPLAY_LENGTH = 50
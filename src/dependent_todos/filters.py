@@ -0,0 +1,68 @@
+"""Task filters shown as tabs in the TUI and offered by the CLI."""
+
+from collections.abc import Callable, Iterator, Set as AbstractSet
+from typing import Literal, get_args
+
+from dependent_todos.models import DynamicStatusT, Task, TaskList
+
+TabFilterType = Literal[
+    "Doing", "Pending", "Ready TODO", "Done", "Blocked", "Cancelled"
+]
+TabFilters = get_args(TabFilterType)
+# Dynamic states of the tasks each tab shows
+TAB_STATES: dict[TabFilterType, tuple[DynamicStatusT, ...]] = {
+    "Doing": ("pending", "in-progress", "blocked"),
+    "Pending": ("pending", "in-progress", "blocked"),
+    "Ready TODO": ("pending", "in-progress"),
+    # A task with completed set counts as done whatever its status, e.g.
+    # after cancelling and uncancelling a done task
+    "Done": ("pending", "in-progress", "blocked", "done"),
+    "Blocked": ("blocked",),
+    "Cancelled": ("cancelled",),
+}
+# Tabs showing only some of the tasks in their states
+TAB_PREDICATES: dict[TabFilterType, Callable[[Task], bool]] = {
+    "Pending": lambda t: t.pending,
+    "Doing": lambda t: t.doing,
+    "Ready TODO": lambda t: t.pending,
+    "Done": lambda t: t.done,
+    "Blocked": lambda t: not t.done,
+}
+
+
+def filter_tasks(tasks: TaskList, filter_state: TabFilterType) -> Iterator[Task]:
+    """Yield the tasks a tab shows, in no particular order.
+
+    Args:
+        tasks: Tasks to filter
+        filter_state: Name of the tab
+
+    Returns:
+        Iterator over the matching tasks
+    """
+    matches = TAB_PREDICATES.get(filter_state)
+    root = tasks.root
+    for state in TAB_STATES[filter_state]:
+        for task_id in tasks.tasks_in_state(state):
+            task = root[task_id]
+            if matches is None or matches(task):
+                yield task
+
+
+def filter_ids(tasks: TaskList, filter_state: TabFilterType) -> AbstractSet[str]:
+    """Get the ids of the tasks a tab shows.
+
+    Tabs showing exactly the tasks in one state get the live index of that
+    state, which must not be modified.
+
+    Args:
+        tasks: Tasks to filter
+        filter_state: Name of the tab
+
+    Returns:
+        IDs of the matching tasks
+    """
+    states = TAB_STATES[filter_state]
+    if len(states) == 1 and filter_state not in TAB_PREDICATES:
+        return tasks.tasks_in_state(states[0])
+    return {t.id for t in filter_tasks(tasks, filter_state)}
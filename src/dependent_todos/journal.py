@@ -0,0 +1,136 @@
+"""Append-only journal storage for tasks.
+
+Every save appends one JSON line per changed task to the journal file, so
+the cost of a save does not depend on the number of tasks. Loading replays
+the journal on top of the last snapshot, a TOML file next to the journal,
+which is rewritten (compacted) once the journal outgrows it.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Literal
+
+from dependent_todos.constants import JOURNAL_COMPACT_MIN_BYTES
+from dependent_todos.models import TaskList
+from dependent_todos.storage import Storage
+from dependent_todos.utils import atomic_write
+
+OperationT = Literal["add", "update", "status", "delete"]
+# Fields changed by a "status" operation
+STATUS_FIELDS = frozenset({"status", "started", "completed"})
+
+
+def apply_operation(tasks_data: dict[str, Any], operation: dict[str, Any]) -> None:
+    """Apply a journal operation to plain task data as written by dump_data.
+
+    Operations carry the new values, so applying one twice has no effect.
+
+    Args:
+        tasks_data: Task id -> task data, modified in place
+        operation: Decoded journal line
+    """
+    op: OperationT = operation["op"]
+    if op == "add":
+        task_data = operation["task"]
+        tasks_data[task_data["id"]] = task_data
+    elif op == "delete":
+        tasks_data.pop(operation["id"], None)
+    else:
+        task_data = tasks_data.get(operation["id"])
+        if task_data is None:
+            return
+        for field, value in operation["fields"].items():
+            if value is None:
+                task_data.pop(field, None)
+            else:
+                task_data[field] = value
+
+
+class JournalStorage(Storage):
+    """Stores tasks as a TOML snapshot plus a journal of later changes.
+
+    Snapshots are ("full", tasks data) or ("append", journal lines).
+    """
+
+    # Every snapshot holds different changes and has to be written
+    coalesce = False
+
+    def __init__(self, file_path: Path):
+        super().__init__(file_path)
+        self.snapshot_path = file_path.with_suffix(".snapshot.toml")
+
+    def _read(self) -> TaskList:
+        return TaskList.model_validate(self._replay())
+
+    def _snapshot_all(self, tasklist: TaskList) -> tuple[str, Any]:
+        return "full", tasklist.dump_data()
+
+    def _snapshot_changes(
+        self, tasklist: TaskList, changes: dict[str, set[str] | None]
+    ) -> tuple[str, Any]:
+        lines = []
+        for task_id, fields in changes.items():
+            task = tasklist.get(task_id)
+            if task is None:
+                operation = {"op": "delete", "id": task_id}
+            elif fields is None:
+                task_data = task.model_dump(mode="json", exclude_none=True)
+                operation = {"op": "add", "task": task_data}
+            else:
+                operation = {
+                    "op": "status" if fields <= STATUS_FIELDS else "update",
+                    "id": task_id,
+                    "fields": task.model_dump(mode="json", include=fields),
+                }
+            lines.append(json.dumps(operation) + "\n")
+        return "append", "".join(lines).encode()
+
+    def _write(self, snapshot: tuple[str, Any]) -> None:
+        kind, payload = snapshot
+        if kind == "full":
+            self._write_snapshot(payload)
+            return
+        if payload:
+            with open(self.file_path, "ab") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+        if self._should_compact():
+            self.compact()
+
+    def compact(self) -> None:
+        """Fold the journal into a fresh snapshot and empty it."""
+        self._write_snapshot(self._replay())
+
+    def _should_compact(self) -> bool:
+        try:
+            journal_size = self.file_path.stat().st_size
+        except FileNotFoundError:
+            # Nothing was appended yet, e.g. saving a list without changes
+            return False
+        try:
+            snapshot_size = self.snapshot_path.stat().st_size
+        except FileNotFoundError:
+            snapshot_size = 0
+        return journal_size > max(JOURNAL_COMPACT_MIN_BYTES, snapshot_size)
+
+    def _replay(self) -> dict[str, Any]:
+        """Read the snapshot and apply the journal to it."""
+        tasks_data = TaskList.read_data(self.snapshot_path) or {}
+        if self.file_path.exists():
+            with open(self.file_path, "rb") as f:
+                for line in f:
+                    try:
+                        operation = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A write interrupted by a crash, nothing follows it
+                        break
+                    apply_operation(tasks_data, operation)
+        return tasks_data
+
+    def _write_snapshot(self, tasks_data: dict[str, Any]) -> None:
+        # A crash between both writes only replays operations the snapshot
+        # already contains
+        TaskList.write_data(tasks_data, self.snapshot_path)
+        atomic_write(self.file_path, b"")
@@ -1,19 +1,43 @@
 """Data models for the dependent todos application."""
 
-import tomllib
+import sys
+from copy import copy, deepcopy
+import weakref
+from array import array
+from bisect import bisect_left, insort
+from collections import deque
+from collections.abc import Iterable, Iterator
 from datetime import datetime
 from pathlib import Path
-from typing import Literal
-from graphlib import TopologicalSorter
+from typing import Any, Literal, NamedTuple
+from graphlib import CycleError
 
-import tomli_w
-
-from pydantic import BaseModel, Field, RootModel
+from pydantic import BaseModel, Field, PrivateAttr, RootModel, field_validator
 
+from dependent_todos.cache import cache_key, read_cache, write_cache
 from dependent_todos.constants import TASK_ID_MAX_LEN, TASK_ID_RE_PATT
+from dependent_todos.utils import atomic_write, paused_gc
 
 StatusT = Literal["pending", "done", "cancelled", "in-progress"]
 DynamicStatusT = Literal["pending", "done", "cancelled", "in-progress", "blocked"]
+SortFieldsT = Literal["created", "started", "completed", "status", "id"]
+# Entry of a sorted index: None values sort last, ties by task id
+SortEntryT = tuple[bool, Any, str]
+# Dynamic states plus "ready" (see TaskList.is_ready) with a membership index
+MembershipT = DynamicStatusT | Literal["ready"]
+MEMBERSHIPS: tuple[MembershipT, ...] = (
+    "pending",
+    "done",
+    "cancelled",
+    "in-progress",
+    "blocked",
+    "ready",
+)
+
+# Task fields the computed state depends on
+STATE_FIELDS = frozenset({"status", "started", "completed", "dependencies"})
+# Task fields stored as ISO 8601 strings
+DATETIME_FIELDS = ("created", "started", "completed")
 
 
 class Task(BaseModel):
@@ -36,6 +60,115 @@ class Task(BaseModel):
     started: datetime | None = Field(None, description="When work began on task")
     completed: datetime | None = Field(None, description="When task was marked done")
 
+    # The TaskList this task belongs to, notified about field changes so it can
+    # keep its indexes up to date. Not part of the task's value: ignored by
+    # ==, and copies and pickles of the task belong to no list
+    _owner: "weakref.ref[TaskList] | None" = PrivateAttr(default=None)
+    # False for tasks loaded without validation, see TaskList.construct_trusted
+    _validated: bool = PrivateAttr(default=True)
+
+    @field_validator("id", "status")
+    @classmethod
+    def _intern(cls, value: str) -> str:
+        # Ids repeat in every dependency list and statuses in every task
+        return sys.intern(value)
+
+    @field_validator("dependencies")
+    @classmethod
+    def _intern_dependencies(cls, value: list[str]) -> list[str]:
+        return [sys.intern(dep_id) for dep_id in value]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BaseModel):
+            return NotImplemented
+        return type(self) is type(other) and self.__dict__ == other.__dict__
+
+    def __copy__(self) -> "Task":
+        copied = super().__copy__()
+        copied._owner = None
+        # model_copy(update=...) adds to the set, which may be shared
+        object.__setattr__(
+            copied, "__pydantic_fields_set__", set(self.__pydantic_fields_set__)
+        )
+        return copied
+
+    def __deepcopy__(self, memo: dict[int, Any] | None = None) -> "Task":
+        copied = super().__deepcopy__(memo)
+        copied._owner = None
+        object.__setattr__(
+            copied, "__pydantic_fields_set__", set(self.__pydantic_fields_set__)
+        )
+        return copied
+
+    def __getstate__(self) -> dict[Any, Any]:
+        state = super().__getstate__()
+        state["__pydantic_private__"] = {
+            **state["__pydantic_private__"],
+            "_owner": None,
+        }
+        return state
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name not in type(self).model_fields:
+            super().__setattr__(name, value)
+            return
+        if not self._validated:
+            self.ensure_validated()
+        if type(self.__pydantic_fields_set__) is frozenset:
+            # Shared between tasks, copy before pydantic adds to it
+            fields_set = set(self.__pydantic_fields_set__)
+            object.__setattr__(self, "__pydantic_fields_set__", fields_set)
+        old = self.__dict__.get(name)
+        super().__setattr__(name, value)
+        owner = self._owner() if self._owner is not None else None
+        if owner is not None:
+            owner._on_task_changed(self, name, old)
+
+    @classmethod
+    def construct_trusted(cls, fields: dict[str, Any]) -> "Task":
+        """Create a task from already parsed field values without validation.
+
+        A much cheaper model_construct: the task is validated on its first
+        edit, see ensure_validated.
+
+        Args:
+            fields: Field values, missing optional fields get their default.
+                Ids and statuses are interned.
+
+        Returns:
+            The unvalidated task
+        """
+        intern = sys.intern
+        task = cls.__new__(cls)
+        values = {
+            "id": intern(fields["id"]),
+            "message": fields["message"],
+            "status": intern(fields.get("status", "pending")),
+            "dependencies": [
+                intern(dep_id) for dep_id in fields.get("dependencies", ())
+            ],
+            "created": fields.get("created") or datetime.now(),
+            "started": fields.get("started"),
+            "completed": fields.get("completed"),
+        }
+        object.__setattr__(task, "__dict__", values)
+        object.__setattr__(task, "__pydantic_fields_set__", TRUSTED_FIELDS_SET)
+        object.__setattr__(task, "__pydantic_extra__", None)
+        object.__setattr__(
+            task, "__pydantic_private__", {"_owner": None, "_validated": False}
+        )
+        return task
+
+    def ensure_validated(self) -> None:
+        """Validate a task that was loaded without validation.
+
+        Raises:
+            pydantic.ValidationError: If the stored fields are invalid
+        """
+        if not self._validated:
+            type(self).model_validate(self.model_dump())
+            self._validated = True
+
     @property
     def cancelled(self) -> bool:
         return self.status == "cancelled"
@@ -71,19 +204,236 @@ class Task(BaseModel):
             self.completed = None
 
 
+# Fields set of every task built by Task.construct_trusted
+TRUSTED_FIELDS_SET = frozenset(Task.model_fields)
+
+
+class TaskListDiff(NamedTuple):
+    """Per-task differences between two task lists."""
+
+    added: list[str]
+    removed: list[str]
+    changed: list[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    @property
+    def task_ids(self) -> set[str]:
+        return {*self.added, *self.removed, *self.changed}
+
+
+class DependencyGraph:
+    """Immutable snapshot of the dependency graph with tasks as integers.
+
+    Task i is ids[i]. Edges are stored in compressed sparse row form: the
+    distinct existing dependencies of task i are
+    dependencies[dependency_start[i]:dependency_start[i + 1]] and its direct
+    dependents likewise in dependents / dependent_start. Dependencies on
+    missing tasks have no edge.
+    """
+
+    __slots__ = (
+        "ids",
+        "index",
+        "dependency_start",
+        "dependencies",
+        "dependent_start",
+        "dependents",
+    )
+
+    def __init__(self, tasks: dict[str, Task]):
+        self.ids = list(tasks)
+        self.index = {task_id: i for i, task_id in enumerate(self.ids)}
+        count = len(self.ids)
+        index = self.index
+        dependency_start = array("i", [0])
+        dependencies = array("i")
+        for task in tasks.values():
+            for dep_id in dict.fromkeys(task.dependencies):
+                dep = index.get(dep_id)
+                if dep is not None:
+                    dependencies.append(dep)
+            dependency_start.append(len(dependencies))
+
+        # Reverse edges with a counting sort by dependency
+        dependent_start = array("i", [0]) * (count + 1)
+        for dep in dependencies:
+            dependent_start[dep + 1] += 1
+        for i in range(count):
+            dependent_start[i + 1] += dependent_start[i]
+        dependents = array("i", [0]) * len(dependencies)
+        fill = dependent_start[:-1]
+        for i in range(count):
+            for k in range(dependency_start[i], dependency_start[i + 1]):
+                dep = dependencies[k]
+                dependents[fill[dep]] = i
+                fill[dep] += 1
+
+        self.dependency_start = dependency_start
+        self.dependencies = dependencies
+        self.dependent_start = dependent_start
+        self.dependents = dependents
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def dependencies_of(self, i: int) -> array:
+        return self.dependencies[
+            self.dependency_start[i] : self.dependency_start[i + 1]
+        ]
+
+    def dependents_of(self, i: int) -> array:
+        return self.dependents[self.dependent_start[i] : self.dependent_start[i + 1]]
+
+    def roots(self) -> list[int]:
+        """Get the tasks no other task depends on, the tops of the trees."""
+        start = self.dependent_start
+        return [i for i in range(len(self.ids)) if start[i] == start[i + 1]]
+
+    def topological_order(self) -> list[int] | None:
+        """Order the tasks dependencies first (Kahn's algorithm).
+
+        Returns:
+            The order, None if the graph contains a cycle
+        """
+        start = self.dependency_start
+        indegree = array("i", (start[i + 1] - start[i] for i in range(len(self.ids))))
+        queue = deque(i for i, degree in enumerate(indegree) if degree == 0)
+        dependent_start, dependents = self.dependent_start, self.dependents
+        order = []
+        while queue:
+            i = queue.popleft()
+            order.append(i)
+            for k in range(dependent_start[i], dependent_start[i + 1]):
+                dependent = dependents[k]
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    queue.append(dependent)
+        return order if len(order) == len(self.ids) else None
+
+
+def _sort_entry(task_id: str, value: Any) -> SortEntryT:
+    return (value is None, value, task_id)
+
+
+def _remove_sort_entry(entries: list[SortEntryT], entry: SortEntryT) -> None:
+    i = bisect_left(entries, entry)
+    if i < len(entries) and entries[i] == entry:
+        del entries[i]
+
+
 class TaskList(RootModel):
     """Collection of tasks with dependency management methods."""
 
     root: dict[str, Task] = Field(default_factory=dict)
 
+    # Reverse dependency index: task id -> ids of tasks depending on it
+    _dependents: dict[str, set[str]] = PrivateAttr(default_factory=dict)
+    # Memoized results of get_task_state, invalidated per task on change
+    _task_states: dict[str, DynamicStatusT] = PrivateAttr(default_factory=dict)
+    # Number of dependencies per task that are missing or not done yet
+    _blockers: dict[str, int] = PrivateAttr(default_factory=dict)
+    # Topological order (dependencies first) repaired locally on every change.
+    # Positions >= 0 index _topo_slots, negative positions -p-1 index
+    # _topo_head so tasks can also be put in front. Deleted slots are None.
+    _topo_slots: list[str | None] = PrivateAttr(default_factory=list)
+    _topo_head: list[str | None] = PrivateAttr(default_factory=list)
+    _topo_pos: dict[str, int] = PrivateAttr(default_factory=dict)
+    # False while no order is maintained: the graph contains a cycle, or the
+    # order was not needed since loading
+    _topo_valid: bool = PrivateAttr(default=True)
+    # Changes since the last pop_changes: task id -> assigned field names, or
+    # None if the task was added, replaced or deleted as a whole
+    _changes: dict[str, set[str] | None] = PrivateAttr(default_factory=dict)
+    # File the tracked changes are relative to, for incremental storage
+    _storage_path: Path | None = PrivateAttr(default=None)
+    # Integer graph for whole-graph algorithms, rebuilt after structural changes
+    _graph: DependencyGraph | None = PrivateAttr(default=None)
+    # Task ids per dynamic state and "ready", built on first use and updated
+    # from _stale_members, the tasks whose state may have changed since
+    _members: dict[MembershipT, set[str]] | None = PrivateAttr(default=None)
+    _member_state: dict[str, DynamicStatusT] = PrivateAttr(default_factory=dict)
+    _stale_members: set[str] = PrivateAttr(default_factory=set)
+    # Task entries sorted by a field, built on first use and kept sorted
+    _sorted: dict[str, list[SortEntryT]] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, context: Any) -> None:
+        self._build_indexes()
+
+    def _build_indexes(self) -> None:
+        """Take ownership of all tasks and index them at once.
+
+        Equivalent to attaching the tasks one by one but avoids the per-task
+        bookkeeping, which dominates loading large lists.
+        """
+        root = self.root
+        owner = weakref.ref(self)
+        dependents: dict[str, set[str]] = {}
+        fields_sets: dict[frozenset[str], frozenset[str]] = {}
+        for task in root.values():
+            # Write the private attribute directly, Task.__setattr__ is slow
+            private = task.__pydantic_private__
+            assert private is not None
+            private["_owner"] = owner
+            # Most tasks set the same fields, share one copy-on-write set
+            fields_set = frozenset(task.__pydantic_fields_set__)
+            fields_set = fields_sets.setdefault(fields_set, fields_set)
+            object.__setattr__(task, "__pydantic_fields_set__", fields_set)
+            for dep_id in task.dependencies:
+                dependents.setdefault(dep_id, set()).add(task.id)
+        blockers = {}
+        for task in root.values():
+            count = 0
+            for dep_id in set(task.dependencies):
+                dep_task = root.get(dep_id)
+                if dep_task is None or dep_task.status != "done":
+                    count += 1
+            blockers[task.id] = count
+        self._dependents = dependents
+        self._blockers = blockers
+        self._task_states = {}
+        self._graph = None
+        self._members = None
+        self._sorted = {}
+        # The topological order is computed when it is first needed
+        self._topo_valid = False
+
+    def __eq__(self, other: object) -> bool:
+        # The indexes are derived from the tasks and not compared
+        if not isinstance(other, TaskList):
+            return NotImplemented
+        return self.root == other.root
+
+    def __copy__(self) -> "TaskList":
+        # A task belongs to one list, the copy gets copies of the tasks
+        return type(self)({task_id: copy(task) for task_id, task in self.root.items()})
+
+    def __deepcopy__(self, memo: dict[int, Any] | None = None) -> "TaskList":
+        return type(self)(
+            {task_id: deepcopy(task, memo) for task_id, task in self.root.items()}
+        )
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        super().__setstate__(state)
+        # Unpickled tasks belong to no list yet
+        self._build_indexes()
+
     def __getitem__(self, item):
         return self.root[item]
 
     def __setitem__(self, key, value):
+        old = self.root.get(key)
+        if old is not None:
+            self._detach(old)
         self.root[key] = value
+        self._attach(value)
+        self._changes[key] = None
 
     def __delitem__(self, key):
-        del self.root[key]
+        task = self.root.pop(key)
+        self._detach(task)
+        self._changes[key] = None
 
     def __len__(self):
         return len(self.root)
@@ -103,33 +453,375 @@ class TaskList(RootModel):
     def values(self):
         return self.root.values()
 
+    def _attach(self, task: Task) -> None:
+        """Take ownership of a task and add it to the indexes."""
+        task._owner = weakref.ref(self)
+        self._graph = None
+        for field, entries in self._sorted.items():
+            insort(entries, _sort_entry(task.id, getattr(task, field)))
+        self._index_dependencies(task.id, task.dependencies)
+        self._blockers[task.id] = self._count_blockers(task)
+        # Dependents counted this id as a blocker while it was missing
+        if task.status == "done":
+            self._shift_dependent_blockers(task.id, -1)
+        self._invalidate_state(task.id, with_dependents=True)
+        # A task without dependencies can start right away and goes first,
+        # any other task goes last which satisfies its own dependencies.
+        # Tasks that already referenced its id are moved behind it.
+        if any(dep_id in self.root for dep_id in task.dependencies):
+            self._topo_pos[task.id] = len(self._topo_slots)
+            self._topo_slots.append(task.id)
+        else:
+            self._topo_pos[task.id] = -len(self._topo_head) - 1
+            self._topo_head.append(task.id)
+        for dependent_id in self._dependents.get(task.id, ()):
+            self._order_edge(task.id, dependent_id)
+
+    def _detach(self, task: Task) -> None:
+        """Release a task and remove it from the indexes."""
+        if task._owner is not None and task._owner() is self:
+            task._owner = None
+        self._graph = None
+        for field, entries in self._sorted.items():
+            _remove_sort_entry(entries, _sort_entry(task.id, getattr(task, field)))
+        self._unindex_dependencies(task.id, task.dependencies)
+        self._blockers.pop(task.id, None)
+        if task.status == "done":
+            self._shift_dependent_blockers(task.id, 1)
+        self._invalidate_state(task.id, with_dependents=True)
+        pos = self._topo_pos.pop(task.id, None)
+        if pos is not None:
+            self._set_topological_slot(pos, None)
+            slots = len(self._topo_head) + len(self._topo_slots)
+            if slots > 2 * len(self._topo_pos) + 32:
+                self._compact_topological_order()
+
+    def _index_dependencies(self, task_id: str, dependencies: list[str]) -> None:
+        for dep_id in dependencies:
+            self._dependents.setdefault(dep_id, set()).add(task_id)
+
+    def _count_blockers(self, task: Task) -> int:
+        """Count the distinct dependencies of a task that are missing or not done."""
+        count = 0
+        for dep_id in set(task.dependencies):
+            dep_task = self.root.get(dep_id)
+            if dep_task is None or dep_task.status != "done":
+                count += 1
+        return count
+
+    def _shift_dependent_blockers(self, task_id: str, delta: int) -> None:
+        """Adjust the blocker count of every direct dependent of a task."""
+        for dependent_id in self._dependents.get(task_id, ()):
+            self._blockers[dependent_id] += delta
+
+    def _unindex_dependencies(self, task_id: str, dependencies: list[str]) -> None:
+        for dep_id in dependencies:
+            dependents = self._dependents.get(dep_id)
+            if dependents is None:
+                continue
+            dependents.discard(task_id)
+            if not dependents:
+                del self._dependents[dep_id]
+
+    def _on_task_changed(self, task: Task, field: str, old: Any) -> None:
+        """Called by an owned task after one of its fields was assigned.
+
+        Args:
+            task: The task that changed
+            field: Name of the assigned field
+            old: Value of the field before the assignment
+        """
+        if self.root.get(task.id) is not task:
+            # Not (or no longer) held by this list under its id
+            return
+        fields = self._changes.setdefault(task.id, set())
+        if fields is not None:
+            fields.add(field)
+        entries = self._sorted.get(field)
+        if entries is not None:
+            _remove_sort_entry(entries, _sort_entry(task.id, old))
+            insort(entries, _sort_entry(task.id, getattr(task, field)))
+        if field == "dependencies":
+            self._graph = None
+            self._unindex_dependencies(task.id, old or [])
+            self._index_dependencies(task.id, task.dependencies)
+            self._blockers[task.id] = self._count_blockers(task)
+            for dep_id in set(task.dependencies).difference(old or []):
+                if dep_id in self.root:
+                    self._order_edge(dep_id, task.id)
+        elif field == "status" and (old == "done") != (task.status == "done"):
+            self._shift_dependent_blockers(task.id, -1 if task.status == "done" else 1)
+        if field in STATE_FIELDS:
+            # Only the stored status of a dependency matters to its dependents
+            self._invalidate_state(task.id, with_dependents=field == "status")
+
+    def _invalidate_state(self, task_id: str, with_dependents: bool = False) -> None:
+        """Drop the memoized state of a task and optionally its direct dependents."""
+        track_members = self._members is not None
+        self._task_states.pop(task_id, None)
+        if track_members:
+            self._stale_members.add(task_id)
+        if with_dependents:
+            for dependent_id in self._dependents.get(task_id, ()):
+                self._task_states.pop(dependent_id, None)
+                if track_members:
+                    self._stale_members.add(dependent_id)
+
+    def tasks_in_state(self, state: MembershipT) -> set[str]:
+        """Get the ids of the tasks in a dynamic state, or the ready tasks.
+
+        The memberships are indexed and kept up to date on changes, so this
+        costs time proportional to the tasks that changed since the last call.
+
+        Args:
+            state: A state returned by get_task_state, or "ready"
+
+        Returns:
+            The live index set, do not modify it
+        """
+        members = self._members
+        if members is None:
+            members = self._members = {
+                name: set() for name in MEMBERSHIPS if name != "ready"
+            }
+            # Ready tasks are exactly the pending ones, share the set
+            members["ready"] = members["pending"]
+            self._member_state = {}
+            stale: Iterable[str] = self.root
+        else:
+            stale = self._stale_members
+        member_state = self._member_state
+        for task_id in stale:
+            old = member_state.pop(task_id, None)
+            if old is not None:
+                members[old].discard(task_id)
+            task = self.root.get(task_id)
+            if task is None:
+                continue
+            new = self.get_task_state(task)
+            members[new].add(task_id)
+            member_state[task_id] = new
+        self._stale_members = set()
+        return members[state]
+
+    def _order_edge(self, before: str, after: str) -> None:
+        """Repair the topological order for a new edge `before` -> `after`.
+
+        Uses the Pearce-Kelly algorithm: only tasks positioned between the two
+        endpoints are searched and reordered among their own positions.
+        """
+        if not self._topo_valid:
+            return
+        lower = self._topo_pos[after]
+        upper = self._topo_pos[before]
+        if upper < lower:
+            return
+
+        # Tasks that have to stay after `after`, limited to the affected region
+        forward: list[str] = []
+        seen = {after}
+        stack = [after]
+        while stack:
+            current = stack.pop()
+            forward.append(current)
+            for dependent_id in self._dependents.get(current, ()):
+                if dependent_id == before:
+                    # The new edge closes a cycle, no order exists anymore
+                    self._topo_valid = False
+                    return
+                if dependent_id not in seen and self._topo_pos[dependent_id] < upper:
+                    seen.add(dependent_id)
+                    stack.append(dependent_id)
+
+        # Tasks that have to stay before `before`, limited to the affected region
+        backward: list[str] = []
+        seen = {before}
+        stack = [before]
+        while stack:
+            current = stack.pop()
+            backward.append(current)
+            for dep_id in self.root[current].dependencies:
+                if (
+                    dep_id not in seen
+                    and dep_id in self._topo_pos
+                    and self._topo_pos[dep_id] > lower
+                ):
+                    seen.add(dep_id)
+                    stack.append(dep_id)
+
+        def by_position(task_id: str) -> int:
+            return self._topo_pos[task_id]
+
+        backward.sort(key=by_position)
+        forward.sort(key=by_position)
+        moved = backward + forward
+        positions = sorted(self._topo_pos[task_id] for task_id in moved)
+        for task_id, pos in zip(moved, positions):
+            self._topo_pos[task_id] = pos
+            self._set_topological_slot(pos, task_id)
+
+    def _set_topological_slot(self, pos: int, task_id: str | None) -> None:
+        if pos >= 0:
+            self._topo_slots[pos] = task_id
+        else:
+            self._topo_head[-pos - 1] = task_id
+
+    def _iter_topological_order(self):
+        """Iterate the task ids in the current topological order."""
+        for task_id in reversed(self._topo_head):
+            if task_id is not None:
+                yield task_id
+        for task_id in self._topo_slots:
+            if task_id is not None:
+                yield task_id
+
+    def _compact_topological_order(self) -> None:
+        """Drop the slots left behind by deleted tasks."""
+        order = list(self._iter_topological_order())
+        self._topo_slots = list(order)
+        self._topo_head = []
+        self._topo_pos = {tid: pos for pos, tid in enumerate(order)}
+
+    def _rebuild_topological_order(self) -> bool:
+        """Compute the topological order from scratch (Kahn's algorithm).
+
+        Returns:
+            False if the dependency graph contains a cycle
+        """
+        graph = self.dependency_graph
+        order = graph.topological_order()
+        self._topo_valid = order is not None
+        if order is not None:
+            ids = graph.ids
+            task_ids = [ids[i] for i in order]
+            self._topo_slots = list(task_ids)
+            self._topo_head = []
+            self._topo_pos = {tid: pos for pos, tid in enumerate(task_ids)}
+        return self._topo_valid
+
+    @property
+    def dependency_graph(self) -> DependencyGraph:
+        """The integer dependency graph, rebuilt if tasks or edges changed."""
+        if self._graph is None:
+            self._graph = DependencyGraph(self.root)
+        return self._graph
+
+    @property
+    def storage_path(self) -> Path | None:
+        """The file the tracked changes are relative to, set by storages."""
+        return self._storage_path
+
+    @storage_path.setter
+    def storage_path(self, value: Path | None) -> None:
+        self._storage_path = value
+
+    def pop_changes(self) -> dict[str, set[str] | None]:
+        """Get and reset the changes made since the last call.
+
+        Returns:
+            Task id -> names of the assigned fields, or None if the task was
+            added or replaced (it is in the list) or deleted (it is not)
+        """
+        changes, self._changes = self._changes, {}
+        return changes
+
+    def get_dependents(self, task_id: str) -> list[str]:
+        """Get the tasks that directly depend on a task.
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            Sorted list of task IDs that have task_id as a dependency
+        """
+        return sorted(self._dependents.get(task_id, ()))
+
+    def has_dependents(self, task_id: str) -> bool:
+        """Check whether any task depends on a task."""
+        return task_id in self._dependents
+
+    def is_blocked(self, task_id: str) -> bool:
+        """Check whether a pending task waits on unfinished dependencies."""
+        task = self.root.get(task_id)
+        return (
+            task is not None
+            and task.status == "pending"
+            and self._blockers[task_id] > 0
+        )
+
+    def is_ready(self, task_id: str) -> bool:
+        """Check whether a task can be worked on (state is "pending")."""
+        task = self.root.get(task_id)
+        return task is not None and self.get_task_state(task) == "pending"
+
+    def mark_done(self, task_id: str) -> set[str]:
+        """Mark a task as done.
+
+        Args:
+            task_id: ID of the task to complete
+
+        Returns:
+            IDs of the pending tasks that were blocked by this task and are
+            not blocked anymore
+        """
+        task = self[task_id]
+        was_done = task.status == "done"
+        task.done = True
+        if was_done:
+            return set()
+        return {
+            tid
+            for tid in self._dependents.get(task_id, ())
+            if self.root[tid].status == "pending" and self._blockers[tid] == 0
+        }
+
     def detect_circular_dependencies(
         self, task_id: str, dependencies: list[str]
     ) -> list[str]:
-        """Detect circular dependencies in the dependency graph.
+        """Detect whether giving a task these dependencies would create a cycle.
+
+        Only the part of the graph reachable from the given dependencies is
+        searched, looking for a path back to task_id.
 
         Args:
             task_id: ID of the task being checked
             dependencies: List of dependency IDs for this task
 
         Returns:
-            List of task IDs that would create a circular dependency, empty if none
+            The offending chain of task IDs, starting and ending with task_id
+            (e.g. ["a", "c", "b", "a"]), empty if there is no cycle
         """
-        from graphlib import CycleError
-
-        # Build the dependency graph including the new task
-        graph = {tid: task.dependencies for tid, task in self.items()}
-        graph[task_id] = dependencies
-
-        ts = TopologicalSorter(graph)
-        try:
-            # Attempt to prepare the graph (this checks for cycles)
-            ts.prepare()
-            return []  # No cycles detected
-        except CycleError:
-            # Could parse the error message to identify specific cycle
-            # For now, return the dependencies that caused the issue
-            return dependencies
+        if task_id in dependencies:
+            return [task_id, task_id]
+        # The last hop back is from a task listing task_id as dependency,
+        # which also covers a task_id that does not exist yet
+        if not self._dependents.get(task_id):
+            return []
+        # Maps each visited task to the task it was reached from
+        reached_from: dict[str, str] = {}
+        stack: list[str] = []
+        for dep_id in dependencies:
+            if dep_id not in reached_from:
+                reached_from[dep_id] = task_id
+                stack.append(dep_id)
+
+        while stack:
+            current = stack.pop()
+            task = self.root.get(current)
+            if task is None:
+                continue
+            for dep_id in task.dependencies:
+                if dep_id == task_id:
+                    path = [current]
+                    while path[-1] != task_id:
+                        path.append(reached_from[path[-1]])
+                    path.reverse()
+                    path.append(task_id)
+                    return path
+                if dep_id not in reached_from:
+                    reached_from[dep_id] = current
+                    stack.append(dep_id)
+        return []
 
     def topological_sort(self) -> list[str]:
         """Perform topological sort on tasks based on dependencies.
@@ -142,18 +834,41 @@ class TaskList(RootModel):
         Raises:
             CycleError: If circular dependencies are detected
         """
-        active_tasks = {
-            tid: task for tid, task in self.items() if task.status != "done"
-        }
+        # The order is maintained incrementally, it is only recomputed after
+        # loading or after a cycle made it invalid
+        if not self._topo_valid and not self._rebuild_topological_order():
+            raise CycleError("tasks have circular dependencies")
+        return [
+            tid
+            for tid in self._iter_topological_order()
+            if self.root[tid].status != "done"
+        ]
 
-        if not active_tasks:
-            return []
+    def sorted_ids(self, field: SortFieldsT, reverse: bool = False) -> list[str]:
+        """Get all task ids ordered by a field.
+
+        The order comes from an index that is kept sorted on changes. Tasks
+        without a value (e.g. not started yet) come last in both directions.
 
-        # Build graph for TopologicalSorter (task -> dependencies)
-        graph = {task_id: task.dependencies for task_id, task in active_tasks.items()}
+        Args:
+            field: Task field to order by
+            reverse: Largest values first
 
-        ts = TopologicalSorter(graph)
-        return list(ts.static_order())
+        Returns:
+            Task ids, ties ordered by id
+        """
+        entries = self._sorted.get(field)
+        if entries is None:
+            entries = self._sorted[field] = sorted(
+                _sort_entry(task.id, getattr(task, field))
+                for task in self.root.values()
+            )
+        if not reverse:
+            return [task_id for _, _, task_id in entries]
+        missing = bisect_left(entries, (True,))
+        return [task_id for _, _, task_id in reversed(entries[:missing])] + [
+            task_id for _, _, task_id in entries[missing:]
+        ]
 
     def get_pending_tasks(self) -> list[str]:
         """Get tasks that are ready to work on (all dependencies completed).
@@ -161,18 +876,20 @@ class TaskList(RootModel):
         Returns:
             List of task IDs that are ready to work on
         """
-        ready = []
-        for task_id, task in self.items():
-            state = self.get_task_state(task)
-            if state == "pending":  # Not blocked, not in progress, not done
-                ready.append(task_id)
-
-        # Sort by creation time (oldest first)
-        ready.sort(key=lambda tid: self[tid].created)
-        return ready
+        # Not blocked, not in progress, not done. Sort by creation time
+        # (oldest first)
+        return sorted(
+            self.tasks_in_state("ready"),
+            key=lambda tid: (self.root[tid].created, tid),
+        )
 
     def get_dependency_tree(
-        self, task_id: str, prefix: str = "", is_last: bool = True
+        self,
+        task_id: str,
+        prefix: str = "",
+        is_last: bool = True,
+        max_depth: int | None = None,
+        max_nodes: int | None = None,
     ) -> str:
         """Generate a tree representation of task dependencies.
 
@@ -180,57 +897,208 @@ class TaskList(RootModel):
             task_id: Root task ID
             prefix: Current prefix for tree drawing
             is_last: Whether this is the last child
+            max_depth: Do not expand tasks deeper than this below the root
+            max_nodes: Stop after this many tasks
 
         Returns:
             String representation of the dependency tree
         """
-        if task_id not in self:
-            return f"{prefix}{'└── ' if is_last else '├── '}{task_id} [not found]\n"
+        return "".join(
+            f"{line}\n"
+            for line in self.iter_dependency_tree(
+                task_id, prefix, is_last, max_depth=max_depth, max_nodes=max_nodes
+            )
+        )
 
-        task = self[task_id]
-        state = self.get_task_state(task)
+    def iter_dependency_tree(
+        self,
+        task_id: str,
+        prefix: str = "",
+        is_last: bool = True,
+        max_depth: int | None = None,
+        max_nodes: int | None = None,
+    ) -> Iterator[str]:
+        """Lazily yield the lines of a dependency tree.
+
+        Every task is expanded once. Later occurrences of a task that has
+        dependencies are marked with "(see above)" instead of being expanded
+        again, which keeps shared subtrees (and cycles) linear in size.
+
+        Args:
+            task_id: Root task ID
+            prefix: Prefix for tree drawing of the root line
+            is_last: Whether the root is the last child
+            max_depth: Do not expand tasks deeper than this below the root,
+                they are marked with "(...)"
+            max_nodes: Stop with a "..." line after this many tasks
+
+        Yields:
+            Lines of the tree without trailing newline
+        """
+        expanded: set[str] = set()
+        # (task id, prefix, is last child, depth), children pushed in reverse
+        stack = [(task_id, prefix, is_last, 0)]
+        count = 0
+        while stack:
+            task_id, prefix, is_last, depth = stack.pop()
+            connector = "└── " if is_last else "├── "
+            if max_nodes is not None and count >= max_nodes:
+                yield f"{prefix}{connector}..."
+                return
+            count += 1
 
-        result = f"{prefix}{'└── ' if is_last else '├── '}{task_id}: {task.message} [{state}]\n"
+            task = self.get(task_id)
+            if task is None:
+                yield f"{prefix}{connector}{task_id} [not found]"
+                continue
 
-        deps = task.dependencies
-        if not deps:
-            return result
+            line = f"{prefix}{connector}{task_id}: {task.message} [{self.get_task_state(task)}]"
+            # Sort dependencies for consistent display
+            deps = sorted(task.dependencies)
+            if deps and task_id in expanded:
+                yield f"{line} (see above)"
+                continue
+            if deps and max_depth is not None and depth >= max_depth:
+                yield f"{line} (...)"
+                continue
+            yield line
+            expanded.add(task_id)
 
-        # Sort dependencies for consistent display
-        deps = sorted(deps)
+            child_prefix = prefix + ("    " if is_last else "│   ")
+            for i in range(len(deps) - 1, -1, -1):
+                stack.append((deps[i], child_prefix, i == len(deps) - 1, depth + 1))
 
-        for i, dep_id in enumerate(deps):
-            is_last_dep = i == len(deps) - 1
-            new_prefix = prefix + ("    " if is_last else "│   ")
-            result += self.get_dependency_tree(dep_id, new_prefix, is_last_dep)
+    def diff(self, other: "TaskList") -> TaskListDiff:
+        """Compare with another task list, e.g. a fresh load of the same file.
 
-        return result
+        Args:
+            other: The newer version of the tasks
+
+        Returns:
+            IDs of tasks only in other, only in self, and with changed fields
+        """
+        added = [tid for tid in other.keys() if tid not in self.root]
+        removed = [tid for tid in self.root if tid not in other]
+        changed = [
+            tid
+            for tid, task in other.items()
+            if tid in self.root and self.root[tid].__dict__ != task.__dict__
+        ]
+        return TaskListDiff(added, removed, changed)
+
+    def apply_diff(self, other: "TaskList", diff: TaskListDiff) -> None:
+        """Update this list in place to match other for the tasks in diff.
+
+        The task objects of other are taken over, so other should not be
+        used afterwards.
+        """
+        for task_id in diff.removed:
+            if task_id in self.root:
+                del self[task_id]
+        for task_id in (*diff.added, *diff.changed):
+            self[task_id] = other[task_id]
 
     @classmethod
-    def load_from_file(cls, file_path: Path) -> "TaskList":
+    def load_from_file(cls, file_path: Path, validate: bool = False) -> "TaskList":
         """Load tasks from a TOML file.
 
+        A file last written by this tool, as recorded by its cache, is
+        loaded without validation. Its tasks are validated when edited.
+
         Args:
             file_path: Path to the TOML file
+            validate: Parse and validate the file even if the cache says it
+                was written by this tool
 
         Returns:
             TaskList of tasks
         """
-        if not file_path.exists():
+        key = cache_key(file_path)
+        if key is None:
             return cls()
-        with open(file_path, "rb") as f:
-            data = tomllib.load(f)
+        cached = None if validate else read_cache(file_path)
+        if cached is not None and cached.validated:
+            with paused_gc():
+                return cls.construct_trusted(cached.data)
+        if cached is not None:
+            data = cached.data
+        else:
+            # Only needed without a cache
+            import tomllib
+
+            with open(file_path, "rb") as f:
+                data = tomllib.load(f)
 
         # Use Pydantic's model_validate
-        return cls.model_validate(data)
+        tasklist = cls.model_validate(data)
+        write_cache(file_path, tasklist.dump_data(), key, validated=True)
+        return tasklist
+
+    @classmethod
+    def construct_trusted(cls, tasks_data: dict[str, Any]) -> "TaskList":
+        """Build tasks from a snapshot taken with dump_data, without validation.
+
+        Args:
+            tasks_data: Data of valid tasks as returned by dump_data
+
+        Returns:
+            TaskList whose tasks are validated when they are first edited
+        """
+        parse_datetime = datetime.fromisoformat
+        tasks = {}
+        for task_id, task_data in tasks_data.items():
+            fields = dict(task_data)
+            for name in DATETIME_FIELDS:
+                value = fields.get(name)
+                if value is not None:
+                    fields[name] = parse_datetime(value)
+            task = Task.construct_trusted(fields)
+            tasks[task.id] = task
+        return cls.model_construct(root=tasks)
 
     def save_to_file(self, file_path: Path) -> None:
-        tasks_data = self.model_dump(mode="json", exclude_none=True)
-        with open(file_path, "wb") as f:
-            tomli_w.dump(tasks_data, f)
+        self.write_data(self.dump_data(), file_path)
+
+    def dump_data(self) -> dict[str, Any]:
+        """Snapshot the tasks as plain data that can be written to TOML."""
+        return self.model_dump(mode="json", exclude_none=True)
+
+    @staticmethod
+    def read_data(file_path: Path) -> dict[str, Any] | None:
+        """Read the plain data of a TOML file, None if it does not exist.
+
+        The parsed data is cached next to the file for the next read.
+        """
+        cached = read_cache(file_path)
+        if cached is not None:
+            return cached.data
+        key = cache_key(file_path)
+        if key is None:
+            return None
+        import tomllib
+
+        with open(file_path, "rb") as f:
+            data = tomllib.load(f)
+        write_cache(file_path, data, key)
+        return data
+
+    @staticmethod
+    def write_data(tasks_data: dict[str, Any], file_path: Path) -> None:
+        """Atomically write a snapshot taken with dump_data to a TOML file."""
+        # Loading and querying tasks does not need the writer
+        import tomli_w
+
+        stat = atomic_write(file_path, tomli_w.dumps(tasks_data).encode())
+        # Another writer may replace the file right after the rename, key the
+        # cache by what was written instead of what is there now
+        key = cache_key(file_path, stat)
+        write_cache(file_path, tasks_data, key, validated=True)
 
     def get_task_state(self, task: Task) -> DynamicStatusT:
-        """Compute the runtime state from stored fields and dependencies.
+        """Get the runtime state from stored fields and dependencies.
+
+        The state of tasks belonging to this list is memoized until the task,
+        or the status of one of its dependencies, changes.
 
         Args:
             task: The task to compute status for
@@ -238,6 +1106,17 @@ class TaskList(RootModel):
         Returns:
             Computed state: "pending", "in-progress", "done", "blocked", or "cancelled"
         """
+        state = self._task_states.get(task.id)
+        owned = self.root.get(task.id) is task
+        if state is not None and owned:
+            return state
+        state = self._compute_task_state(task)
+        if owned:
+            self._task_states[task.id] = state
+        return state
+
+    def _compute_task_state(self, task: Task) -> DynamicStatusT:
+        """Compute the runtime state of a task without using the cache."""
         if task.cancelled:
             return "cancelled"
 
@@ -246,10 +1125,12 @@ class TaskList(RootModel):
 
         if task.status == "pending":
             # Check if any dependencies are not done
-            for dep_id in task.dependencies:
-                dep_task = self.get(dep_id)
-                if dep_task is None or dep_task.status != "done":
-                    return "blocked"
+            if self.root.get(task.id) is task:
+                blockers = self._blockers[task.id]
+            else:
+                blockers = self._count_blockers(task)
+            if blockers:
+                return "blocked"
 
             # No blocking dependencies
             if task.started is not None and task.completed is None:
@@ -0,0 +1,132 @@
+"""Profiling of TUI sessions for bug reports about slowness.
+
+While a Profiler is active, cProfile records the main thread and functions
+decorated with timed(), as well as span() blocks, record how long each call
+took. Both end up in a text report, the cProfile data also in a .prof file
+next to it for tools like snakeviz.
+"""
+
+import functools
+import io
+import platform
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, ParamSpec, TypeVar
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# Functions listed in the report, by cumulative time
+REPORT_FUNCTIONS = 40
+
+_active: "Profiler | None" = None
+
+
+class Profiler:
+    """Records a cProfile profile and timing spans while entered."""
+
+    def __init__(self) -> None:
+        import cProfile
+
+        self.profile = cProfile.Profile()
+        # Span name -> seconds taken by each call
+        self.spans: dict[str, list[float]] = {}
+        self.started: datetime | None = None
+        self.duration = 0.0
+
+    def __enter__(self) -> "Profiler":
+        global _active
+        _active = self
+        self.started = datetime.now()
+        self._start = time.perf_counter()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        global _active
+        self.profile.disable()
+        self.duration = time.perf_counter() - self._start
+        _active = None
+
+    def add_span(self, name: str, seconds: float) -> None:
+        self.spans.setdefault(name, []).append(seconds)
+
+    def format_spans(self) -> str:
+        """Format the spans as a table, slowest total first."""
+        lines = [f"{'span':<40} {'calls':>7} {'total':>10} {'mean':>9} {'max':>9}"]
+        for name, times in sorted(self.spans.items(), key=lambda kv: -sum(kv[1])):
+            total = sum(times)
+            lines.append(
+                f"{name:<40} {len(times):>7} {total * 1000:>8.1f}ms "
+                f"{total / len(times) * 1000:>7.2f}ms {max(times) * 1000:>7.2f}ms"
+            )
+        return "\n".join(lines)
+
+    def write_report(self, file_path: Path, info: dict[str, Any]) -> None:
+        """Write the report and the cProfile data (with suffix .prof).
+
+        Args:
+            file_path: Path of the text report
+            info: Details of the session listed at the top of the report
+        """
+        import pstats
+
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=stream)
+        stats.sort_stats("cumulative").print_stats(REPORT_FUNCTIONS)
+        header = {
+            "Started": self.started.isoformat(timespec="seconds")
+            if self.started
+            else None,
+            "Duration": f"{self.duration:.1f}s",
+            "Python": platform.python_version(),
+            "Platform": platform.platform(),
+            **info,
+        }
+        sections = [
+            "\n".join(f"{key}: {value}" for key, value in header.items()),
+            "Timing spans, including nested spans\n\n" + self.format_spans(),
+            "cProfile of the main thread\n" + stream.getvalue(),
+        ]
+        file_path.write_text("\n\n".join(sections))
+        self.profile.dump_stats(file_path.with_suffix(".prof"))
+
+
+def timed(func: Callable[P, R]) -> Callable[P, R]:
+    """Record the calls of a function as a span named after it."""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        profiler = _active
+        if profiler is None:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.add_span(name, time.perf_counter() - start)
+
+    return wrapper
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Record the time taken by a block as a span."""
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.add_span(name, time.perf_counter() - start)
+
+
+def default_report_path() -> Path:
+    """Get a report path in the working directory, unique per session."""
+    return Path(f"todos-profile-{datetime.now():%Y%m%d-%H%M%S}.txt")
@@ -0,0 +1,191 @@
+"""SQLite storage for tasks.
+
+Tasks and their dependency edges are kept in normalized tables, so a save
+only touches the rows of changed tasks and lookups by status or dependency
+are answered from indexes instead of parsing every task.
+"""
+
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Literal
+
+from dependent_todos.models import Task, TaskList
+from dependent_todos.storage import Storage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created TEXT NOT NULL,
+    started TEXT,
+    completed TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS tasks_created ON tasks (created);
+CREATE TABLE IF NOT EXISTS dependencies (
+    task_id TEXT NOT NULL REFERENCES tasks (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    depends_on TEXT NOT NULL,
+    PRIMARY KEY (task_id, position)
+);
+CREATE INDEX IF NOT EXISTS dependencies_depends_on ON dependencies (depends_on);
+"""
+# Columns of the tasks table holding a Task field of the same name
+TASK_COLUMNS = ("id", "message", "status", "created", "started", "completed")
+
+StatementT = tuple[str, tuple[Any, ...]]
+SnapshotT = tuple[Literal["full", "update"], list[StatementT]]
+
+
+def _task_row(task: Task) -> tuple[Any, ...]:
+    data = task.model_dump(mode="json", include=set(TASK_COLUMNS))
+    return tuple(data[column] for column in TASK_COLUMNS)
+
+
+def _dependency_statements(task: Task) -> list[StatementT]:
+    statements: list[StatementT] = [
+        ("DELETE FROM dependencies WHERE task_id = ?", (task.id,))
+    ]
+    statements.extend(
+        (
+            "INSERT INTO dependencies (task_id, position, depends_on) VALUES (?, ?, ?)",
+            (task.id, position, dep_id),
+        )
+        for position, dep_id in enumerate(task.dependencies)
+    )
+    return statements
+
+
+def _upsert_statement(task: Task) -> StatementT:
+    # New tasks go last, replaced ones keep their position
+    updates = ", ".join(f"{column} = excluded.{column}" for column in TASK_COLUMNS)
+    return (
+        f"INSERT INTO tasks ({', '.join(TASK_COLUMNS)}, position) "
+        f"VALUES ({', '.join('?' * len(TASK_COLUMNS))}, "
+        "(SELECT COALESCE(MAX(position), -1) + 1 FROM tasks)) "
+        f"ON CONFLICT (id) DO UPDATE SET {updates}",
+        _task_row(task),
+    )
+
+
+class SqliteStorage(Storage):
+    """Stores tasks in an SQLite database.
+
+    Snapshots are ("full", statements) or ("update", statements), written in
+    one transaction.
+    """
+
+    # Every snapshot holds different changes and has to be written
+    coalesce = False
+
+    def __init__(self, file_path: Path):
+        super().__init__(file_path)
+        # Whether the tables and indexes were created by an earlier connection
+        self._schema_created = False
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per operation: writes run in the writer thread
+        conn = sqlite3.connect(self.file_path)
+        conn.execute("PRAGMA foreign_keys = ON")
+        if not self._schema_created:
+            conn.executescript(SCHEMA)
+            self._schema_created = True
+        return conn
+
+    def _read(self) -> TaskList:
+        if not self.file_path.exists():
+            return TaskList()
+        with closing(self._connect()) as conn:
+            return TaskList.model_validate(self._read_tasks(conn))
+
+    def _read_tasks(self, conn: sqlite3.Connection) -> dict[str, Any]:
+        conn.row_factory = sqlite3.Row
+        tasks_data: dict[str, Any] = {}
+        rows = conn.execute(
+            f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks ORDER BY position"
+        )
+        for row in rows:
+            task_data = {k: row[k] for k in TASK_COLUMNS if row[k] is not None}
+            task_data["dependencies"] = []
+            tasks_data[row["id"]] = task_data
+        rows = conn.execute(
+            "SELECT task_id, depends_on FROM dependencies ORDER BY task_id, position"
+        )
+        for row in rows:
+            tasks_data[row["task_id"]]["dependencies"].append(row["depends_on"])
+        return tasks_data
+
+    def _snapshot_all(self, tasklist: TaskList) -> SnapshotT:
+        statements: list[StatementT] = [("DELETE FROM tasks", ())]
+        for task in tasklist.values():
+            statements.append(_upsert_statement(task))
+            statements.extend(_dependency_statements(task))
+        return "full", statements
+
+    def _snapshot_changes(
+        self, tasklist: TaskList, changes: dict[str, set[str] | None]
+    ) -> SnapshotT:
+        statements: list[StatementT] = []
+        for task_id, fields in changes.items():
+            task = tasklist.get(task_id)
+            if task is None:
+                statements.append(("DELETE FROM tasks WHERE id = ?", (task_id,)))
+                continue
+            if fields is None:
+                statements.append(_upsert_statement(task))
+                statements.extend(_dependency_statements(task))
+                continue
+            columns = sorted(fields.intersection(TASK_COLUMNS))
+            if columns:
+                data = task.model_dump(mode="json", include=set(columns))
+                assignments = ", ".join(f"{column} = ?" for column in columns)
+                statements.append(
+                    (
+                        f"UPDATE tasks SET {assignments} WHERE id = ?",
+                        (*(data[column] for column in columns), task_id),
+                    )
+                )
+            if "dependencies" in fields:
+                statements.extend(_dependency_statements(task))
+        return "update", statements
+
+    def _write(self, snapshot: SnapshotT) -> None:
+        _, statements = snapshot
+        with closing(self._connect()) as conn, conn:
+            for sql, params in statements:
+                conn.execute(sql, params)
+
+    def task_ids_with_status(self, status: str) -> list[str]:
+        """Get the ids of tasks with a stored status using the status index.
+
+        Args:
+            status: Stored status, e.g. "pending" or "done"
+
+        Returns:
+            Task ids in list order
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT id FROM tasks WHERE status = ? ORDER BY position", (status,)
+            )
+            return [task_id for (task_id,) in rows]
+
+    def get_dependents(self, task_id: str) -> list[str]:
+        """Get the tasks that directly depend on a task using the edge index.
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            Sorted ids of the tasks listing task_id as a dependency
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT task_id FROM dependencies WHERE depends_on = ? "
+                "ORDER BY task_id",
+                (task_id,),
+            )
+            return [dependent for (dependent,) in rows]
@@ -1,28 +1,238 @@
-"""TOML-based storage for tasks."""
+"""Storage for tasks, TOML-based unless the config file extension says otherwise."""
 
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
-
+from .config import get_storage_backend
 from .models import TaskList
 
+FileSignature = tuple[int, int]
+
+
+class Storage(ABC):
+    """Reads and writes the tasks of one file.
+
+    Storages that write only what changed override _snapshot_changes. They
+    write all tasks instead when the tasks do not stem from their file or
+    the previous write failed, since the file may then miss changes.
+    """
+
+    # Only the latest snapshot needs to be written
+    coalesce = True
+
+    def __init__(self, file_path: Path):
+        self.file_path = file_path
+        # After a failed write the file misses changes, rewrite everything
+        self._write_failed = False
+
+    def load(self) -> TaskList:
+        """Read the tasks, later snapshots are relative to them."""
+        tasklist = self._read()
+        tasklist.storage_path = self.file_path
+        return tasklist
+
+    def snapshot(self, tasklist: TaskList) -> Any:
+        """Capture what the next write needs, called where tasks are mutated."""
+        changes = tasklist.pop_changes()
+        if tasklist.storage_path != self.file_path or self._write_failed:
+            tasklist.storage_path = self.file_path
+            self._write_failed = False
+            return self._snapshot_all(tasklist)
+        return self._snapshot_changes(tasklist, changes)
+
+    def write(self, snapshot: Any) -> None:
+        """Write a snapshot, may be called from a background thread."""
+        try:
+            self._write(snapshot)
+        except Exception:
+            self._write_failed = True
+            raise
+
+    @abstractmethod
+    def _read(self) -> TaskList:
+        """Read all tasks from the file."""
+
+    @abstractmethod
+    def _snapshot_all(self, tasklist: TaskList) -> Any:
+        """Capture all tasks for writing."""
+
+    def _snapshot_changes(
+        self, tasklist: TaskList, changes: dict[str, set[str] | None]
+    ) -> Any:
+        """Capture the changes since the last snapshot, by default all tasks."""
+        return self._snapshot_all(tasklist)
+
+    @abstractmethod
+    def _write(self, snapshot: Any) -> None:
+        """Write a snapshot taken by _snapshot_all or _snapshot_changes."""
+
+
+class TomlStorage(Storage):
+    """Stores all tasks in one TOML file that is rewritten on every save."""
+
+    def __init__(self, file_path: Path, validate: bool = False):
+        super().__init__(file_path)
+        # Validate the file even if this tool wrote it
+        self.validate = validate
+
+    def _read(self) -> TaskList:
+        return TaskList.load_from_file(self.file_path, validate=self.validate)
+
+    def _snapshot_all(self, tasklist: TaskList) -> dict[str, Any]:
+        return tasklist.dump_data()
+
+    def _write(self, snapshot: dict[str, Any]) -> None:
+        TaskList.write_data(snapshot, self.file_path)
+
+
+def get_storage(file_path: Path, validate: bool = False) -> Storage:
+    """Get the storage for a file based on its extension.
+
+    Args:
+        file_path: Path to the tasks file
+        validate: Always validate the loaded tasks, instead of trusting a
+            TOML file last written by this tool
+
+    Returns:
+        Storage reading and writing the file
+    """
+    backend = get_storage_backend(file_path)
+    # The other backends are imported when used, sqlite3 alone is slow to import
+    if backend == "journal":
+        from .journal import JournalStorage
+
+        return JournalStorage(file_path)
+    if backend == "sqlite":
+        from .sqlite import SqliteStorage
+
+        return SqliteStorage(file_path)
+    return TomlStorage(file_path, validate=validate)
+
 
 def load_tasks_from_file(file_path: Path) -> TaskList:
-    """Load tasks from a TOML file.
+    """Load tasks from a file.
 
     Args:
-        file_path: Path to the TOML file
+        file_path: Path to the tasks file
 
     Returns:
         TaskList of tasks
     """
-    return TaskList.load_from_file(file_path)
+    return get_storage(file_path).load()
 
 
 def save_tasks_to_file(tasklist: TaskList, file_path: Path) -> None:
-    """Save tasks to a TOML file.
+    """Save tasks to a file.
 
     Args:
         tasklist: TaskList of tasks to save
-        file_path: Path to save the TOML file
+        file_path: Path to save the tasks file
+    """
+    storage = get_storage(file_path)
+    storage.write(storage.snapshot(tasklist))
+
+
+def file_signature(file_path: Path) -> FileSignature | None:
+    """Get a cheap fingerprint of a file to detect changes on disk.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Modification time in nanoseconds and size, None if the file is missing
+    """
+    try:
+        stat = file_path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class WriteBehindSaver:
+    """Write task snapshots to storage from a background thread.
+
+    submit() snapshots the tasks in the calling thread and returns
+    immediately. Snapshots are written in order; for storages that rewrite
+    the whole file only the latest one is, so snapshots submitted while a
+    write is in progress end up in one write.
     """
-    tasklist.save_to_file(file_path)
+
+    def __init__(
+        self,
+        storage: Storage,
+        on_saved: Callable[[FileSignature | None], None] | None = None,
+        on_error: Callable[[Exception], None] | None = None,
+    ):
+        self.storage = storage
+        self.on_saved = on_saved
+        self.on_error = on_error
+        self._snapshots: list[Any] = []
+        self._writing = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def pending(self) -> bool:
+        """Whether a submitted snapshot has not been written yet."""
+        with self._cond:
+            return bool(self._snapshots) or self._writing
+
+    def submit(self, tasklist: TaskList) -> None:
+        """Queue the current state of the tasks for writing."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("saver is closed")
+            snapshot = self.storage.snapshot(tasklist)
+            if self.storage.coalesce:
+                self._snapshots.clear()
+            self._snapshots.append(snapshot)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="todos-writer", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until all submitted snapshots are written.
+
+        Returns:
+            False if the timeout expired first
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._snapshots and not self._writing, timeout
+            )
+
+    def close(self) -> None:
+        """Write outstanding snapshots and stop the writer thread."""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._snapshots or self._closed)
+                if not self._snapshots:
+                    return
+                snapshot = self._snapshots.pop(0)
+                self._writing = True
+            try:
+                self.storage.write(snapshot)
+                if self.on_saved is not None:
+                    self.on_saved(file_signature(self.storage.file_path))
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(e)
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
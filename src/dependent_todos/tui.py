@@ -1,42 +1,74 @@
 """Textual TUI interface for dependent todos."""
 
 import argparse
-from datetime import datetime
+from abc import abstractmethod
+from contextlib import nullcontext
 from textual.app import App, ComposeResult
-from typing import cast, Literal, Any
-from collections.abc import Callable
+from typing import TYPE_CHECKING, ClassVar, cast, Literal
+from collections.abc import Set as AbstractSet
 
-from textual.binding import Binding
+from rich.style import Style
+from rich.text import Text
+from textual.binding import Binding, BindingType
+from textual.cache import LRUCache
 from textual.containers import Container, Grid
+from textual.geometry import Size
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
 from textual.widgets import (
     Button,
     DataTable,
     Footer,
     Header,
-    Input,
-    SelectionList,
     Static,
     Tabs,
-    TextArea,
     Tree,
 )
-from textual.widgets.selection_list import Selection
+from textual.widgets.tree import TreeNode
 from textual.screen import ModalScreen
 from textual import events, on
+from textual.message import Message
+from textual.timer import Timer
 
 from dependent_todos.config import get_config_path
-from dependent_todos.constants import TODOS_CONFIG_NAME
+from dependent_todos.constants import (
+    MAX_MESSAGE_DISPLAY_LENGTH,
+    TASK_ID_MAX_LEN,
+    TODOS_CONFIG_NAME,
+)
 
-from dependent_todos.models import Task, TaskList, DynamicStatusT
-from dependent_todos.storage import load_tasks_from_file, save_tasks_to_file
+from dependent_todos.filters import (
+    TabFilters,
+    TabFilterType,
+    filter_ids,
+    filter_tasks,
+)
+from dependent_todos.models import (
+    DynamicStatusT,
+    SortFieldsT,
+    Task,
+    TaskList,
+    TaskListDiff,
+)
+from dependent_todos.storage import (
+    FileSignature,
+    WriteBehindSaver,
+    file_signature,
+    get_storage,
+)
+from dependent_todos.profiling import Profiler, default_report_path, span, timed
+from dependent_todos.watcher import FileWatcher
 from dependent_todos.utils import generate_unique_id
 from typing import get_args
 
-TabFilterType = Literal[
-    "Doing", "Pending", "Ready TODO", "Done", "Blocked", "Cancelled"
-]
-TabFilters = get_args(TabFilterType)
-SortFieldsT = Literal["created", "started", "completed", "status", "id"]
+if TYPE_CHECKING:
+    # Only the modals use these, they are imported when a modal opens
+    from textual.widgets import Input, SelectionList, TextArea
+    from textual.notifications import SeverityLevel
+    from textual.widgets.selection_list import Selection
+
+SortFields = get_args(SortFieldsT)
 STATE_COLORS: dict[DynamicStatusT, str] = {
     "pending": "yellow",
     "in-progress": "blue",
@@ -58,20 +90,11 @@ class FocusableTabs(Tabs):
 
     @staticmethod
     def filtered_tasks(tasks: TaskList, filter_state: TabFilterType):
-        """This is a nice and type safe way to not use case or if else statements and python
-        can also compile it more efficiently since the code paths are better defined"""
-        fn_nmap: dict[TabFilterType, Callable[[Task], bool]] = {
-            "Pending": lambda t: t.pending,
-            "Doing": lambda t: t.doing,
-            "Ready TODO": lambda t: t.pending
-            and tasks.get_task_state(task) != "blocked",
-            "Blocked": lambda t: not t.done and tasks.get_task_state(t) == "blocked",
-            "Done": lambda t: t.done,
-            "Cancelled": lambda t: t.cancelled,
-        }
-        for task_id, task in tasks.items():
-            if fn_nmap[filter_state](task):
-                yield task
+        return filter_tasks(tasks, filter_state)
+
+    @staticmethod
+    def filtered_ids(tasks: TaskList, filter_state: TabFilterType) -> AbstractSet[str]:
+        return filter_ids(tasks, filter_state)
 
 
 def fmt_state(status, text: str | None = None):
@@ -88,34 +111,47 @@ def get_status_display(task: Task, tasks: TaskList) -> str:
     )
 
 
-def _sort_func(by: SortFieldsT = "created") -> Callable[[Task], Any]:
-    """Returns a sort function for sorted"""
+# Bindings of the task tables on top of their navigation bindings
+TASK_TABLE_BINDINGS: list[BindingType] = [
+    ("e", "update_task", "Update"),
+    ("d", "delete_task", "Delete"),
+    ("m", "mark_done", "Mark done"),
+    ("c", "cancel_task", "Cancel"),
+    ("s", "cycle_sort", "Sort"),
+]
 
-    def sort(task: Task) -> Any:
-        return getattr(task, by, 0)
 
-    return sort
+class TaskTableMixin:
+    """Filtering, sorting and actions shared by the task tables."""
 
+    DT_FMT = "%Y-%m-%d %H:%M"
+    COLUMNS = {
+        "id": "ID",
+        "status": "Status",
+        "created": "Created",
+        "message": "Message",
+    }
 
-class TaskTable(DataTable):
-    """Data table for displaying tasks."""
+    tasks: TaskList
+    filter_state: TabFilterType
+    sort_field: SortFieldsT
+    sort_reverse: bool
 
-    DT_FMT = "%Y-%m-%d %H:%M"
+    if TYPE_CHECKING:
+        # Provided by the widget class the mixin is combined with
 
-    BINDINGS = DataTable.BINDINGS + [
-        ("e", "update_task", "Update"),
-        ("d", "delete_task", "Delete"),
-        ("m", "mark_done", "Mark done"),
-        ("c", "cancel_task", "Cancel"),
-    ]
+        @property
+        def app(self) -> "DependentTodosApp": ...
 
-    def __init__(self, tasks: TaskList, filter_state: TabFilterType = "all", **kwargs):
-        super().__init__(**kwargs)
-        self.tasks = tasks
-        self.filter_state: TabFilterType = filter_state
-        self.can_focus = True
-        self.add_columns("ID", "Status", "Created", "Message")
-        self._populate_table()
+        def notify(
+            self,
+            message: str,
+            *,
+            title: str = "",
+            severity: SeverityLevel = "information",
+            timeout: float | None = None,
+            markup: bool = True,
+        ) -> None: ...
 
     def action_update_task(self):
         self.app.action_update_task()
@@ -129,41 +165,342 @@ class TaskTable(DataTable):
     def action_cancel_task(self):
         self.app.action_cancel_task()
 
+    def action_cycle_sort(self):
+        """Sort by the next field, including fields without a column."""
+        index = (SortFields.index(self.sort_field) + 1) % len(SortFields)
+        self.set_sort(SortFields[index])
+        direction = "descending" if self.sort_reverse else "ascending"
+        self.notify(f"Sorted by {self.sort_field} ({direction})")
+
+    def set_sort(self, field: SortFieldsT) -> None:
+        """Sort by a field, toggling the direction if it is already sorted by it."""
+        if field == self.sort_field:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_field = field
+            self.sort_reverse = False
+        self._populate_table()
+
+    def filtered_ids(self, by: SortFieldsT, reverse: bool = True) -> list[str]:
+        filtered = FocusableTabs.filtered_ids(self.tasks, self.filter_state)
+        # Pick the tasks from the presorted index instead of sorting them
+        return [
+            task_id
+            for task_id in self.tasks.sorted_ids(by, reverse=reverse)
+            if task_id in filtered
+        ]
+
+    def _row_values(self, task: Task) -> tuple[str, str, str, str]:
+        return (
+            task.id,
+            get_status_display(task, self.tasks),
+            task.created.strftime(self.DT_FMT),
+            task.message,
+        )
+
+    @abstractmethod
+    def _populate_table(self) -> None:
+        """Show the filtered tasks in the current sort order."""
+
+    def refresh_data(self, tasks: TaskList):
+        """Refresh the table with new task data."""
+        self.tasks = tasks
+        self._populate_table()
+
+
+class TaskTable(TaskTableMixin, DataTable):
+    """Data table for displaying tasks."""
+
+    # Removing a row re-indexes all rows below it, past this many removals
+    # starting over is cheaper
+    MAX_ROW_REMOVALS = 32
+
+    BINDINGS = DataTable.BINDINGS + TASK_TABLE_BINDINGS
+
+    def __init__(
+        self, tasks: TaskList, filter_state: TabFilterType = "Doing", **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.tasks = tasks
+        self.filter_state: TabFilterType = filter_state
+        self.sort_field: SortFieldsT = "created"
+        self.sort_reverse = True
+        self.can_focus = True
+        for key, label in self.COLUMNS.items():
+            self.add_column(label, key=key)
+        self._populate_table()
+
+    def on_data_table_header_selected(self, event: DataTable.HeaderSelected) -> None:
+        field = event.column_key.value
+        if field in SortFields:
+            self.set_sort(cast(SortFieldsT, field))
+
     def filtered_tasks(self, by: SortFieldsT, reverse: bool = True) -> dict[str, Task]:
         return {
-            t.id: t
-            for t in sorted(
-                FocusableTabs.filtered_tasks(self.tasks, self.filter_state),
-                reverse=reverse,
-                key=_sort_func(by=by),
-            )
+            task_id: self.tasks[task_id]
+            for task_id in self.filtered_ids(by, reverse=reverse)
         }
 
+    @timed
     def _populate_table(self):
-        """Populate the table with task data."""
-        # Clear existing rows
-        self.clear()
+        """Populate the table with task data.
+
+        Rows are keyed by task id and reconciled with the current content:
+        only rows that appeared, disappeared or changed are touched, and the
+        cursor stays on the highlighted task.
+        """
+        rows = {
+            task_id: self._row_values(task)
+            for task_id, task in self.filtered_tasks(
+                by=self.sort_field, reverse=self.sort_reverse
+            ).items()
+        }
+        cursor_task_id = None
+        if self.is_valid_row_index(self.cursor_row):
+            cursor_task_id = self.coordinate_to_cell_key(
+                self.cursor_coordinate
+            ).row_key.value
+
+        stale = [row_key for row_key in self.rows if row_key.value not in rows]
+        if len(stale) > self.MAX_ROW_REMOVALS:
+            self.clear()
+        else:
+            for row_key in stale:
+                self.remove_row(row_key)
 
-        if not self.tasks:
-            return
-        for task_id, task in self.filtered_tasks(by="created").items():
-            combined_status = get_status_display(task, self.tasks)
-
-            self.add_row(
-                task_id,
-                combined_status,
-                task.created.strftime(self.DT_FMT),
-                task.message,
-            )
+        for task_id, values in rows.items():
+            if task_id not in self.rows:
+                self.add_row(*values, key=task_id)
+                continue
+            for column_key, old, new in zip(
+                self.COLUMNS, self.get_row(task_id), values
+            ):
+                if old != new:
+                    self.update_cell(task_id, column_key, new)
+
+        # New rows are appended, restore the order if that broke it
+        if [row.key.value for row in self.ordered_rows] != list(rows):
+            positions = {task_id: pos for pos, task_id in enumerate(rows)}
+            self.sort("id", key=positions.__getitem__)
+
+        if cursor_task_id in rows:
+            row_index = self.get_row_index(cursor_task_id)
+            if row_index != self.cursor_row:
+                self.move_cursor(row=row_index)
+
+
+class VirtualTaskTable(TaskTableMixin, ScrollView, can_focus=True):
+    """Task table that only renders the rows in the viewport.
+
+    Instead of a DataTable row per task, the ordered ids of the filtered
+    tasks are kept and a row is formatted from the task list when it is
+    painted. Formatted rows near the viewport are cached, so a tab with 200k
+    tasks opens as fast as one with 20.
+    """
+
+    COMPONENT_CLASSES = {
+        "virtual-task-table--header",
+        "virtual-task-table--cursor",
+        "virtual-task-table--even-row",
+    }
+    DEFAULT_CSS = """
+    VirtualTaskTable {
+        background: $surface;
+        color: $foreground;
+
+        & > .virtual-task-table--header {
+            text-style: bold;
+            background: $panel;
+            color: $foreground;
+        }
+        & > .virtual-task-table--even-row {
+            background: $surface-lighten-1 50%;
+        }
+        & > .virtual-task-table--cursor {
+            background: $block-cursor-blurred-background;
+            color: $block-cursor-blurred-foreground;
+        }
+        &:focus > .virtual-task-table--cursor {
+            background: $block-cursor-background;
+            color: $block-cursor-foreground;
+            text-style: $block-cursor-text-style;
+        }
+    }
+    """
+    BINDINGS: ClassVar[list[BindingType]] = [
+        Binding("up", "cursor_up", "Cursor up", show=False),
+        Binding("down", "cursor_down", "Cursor down", show=False),
+        Binding("pageup", "page_up", "Page up", show=False),
+        Binding("pagedown", "page_down", "Page down", show=False),
+        Binding("home", "cursor_home", "First row", show=False),
+        Binding("end", "cursor_end", "Last row", show=False),
+    ] + TASK_TABLE_BINDINGS
+    # Width of each column, the message is cut off beyond its width
+    COLUMN_WIDTHS = {
+        "id": TASK_ID_MAX_LEN,
+        "status": len("in-progress [blocked]"),
+        "created": len("YYYY-MM-DD HH:MM"),
+        "message": MAX_MESSAGE_DISPLAY_LENGTH,
+    }
+    # Formatted rows kept for repainting, a few screens worth
+    ROW_CACHE_SIZE = 1024
 
-    def refresh_data(self, tasks: TaskList):
-        """Refresh the table with new task data."""
+    cursor_row: reactive[int] = reactive(0)
+
+    class RowHighlighted(Message):
+        """Posted when the cursor moves to another task."""
+
+        def __init__(self, task_id: str) -> None:
+            super().__init__()
+            self.task_id = task_id
+
+    def __init__(
+        self, tasks: TaskList, filter_state: TabFilterType = "Doing", **kwargs
+    ):
+        super().__init__(**kwargs)
         self.tasks = tasks
+        self.filter_state: TabFilterType = filter_state
+        self.sort_field: SortFieldsT = "created"
+        self.sort_reverse = True
+        # Ids of the shown tasks in display order, rows are formatted lazily
+        self.task_ids: list[str] = []
+        self._row_cache: LRUCache[str, Strip] = LRUCache(self.ROW_CACHE_SIZE)
+        self._highlighted: str | None = None
         self._populate_table()
 
+    @property
+    def cursor_task_id(self) -> str | None:
+        """ID of the task under the cursor."""
+        if 0 <= self.cursor_row < len(self.task_ids):
+            return self.task_ids[self.cursor_row]
+        return None
+
+    def on_mount(self) -> None:
+        self._post_highlighted()
+
+    @timed
+    def _populate_table(self):
+        """Take the ids of the shown tasks, keeping the cursor on its task."""
+        cursor_task_id = self.cursor_task_id
+        self.task_ids = self.filtered_ids(by=self.sort_field, reverse=self.sort_reverse)
+        self._row_cache.clear()
+        width = sum(self.COLUMN_WIDTHS.values()) + len(self.COLUMN_WIDTHS) + 1
+        # The header is the first line
+        self.virtual_size = Size(width, len(self.task_ids) + 1)
+        row = self.cursor_row
+        if cursor_task_id is not None:
+            try:
+                row = self.task_ids.index(cursor_task_id)
+            except ValueError:
+                pass
+        self.cursor_row = self.validate_cursor_row(row)
+        self.refresh()
+        if self.is_mounted:
+            self._post_highlighted()
+
+    def validate_cursor_row(self, row: int) -> int:
+        return max(0, min(row, len(self.task_ids) - 1))
+
+    def watch_cursor_row(self, old_row: int, row: int) -> None:
+        # Keep the cursor between the header and the bottom edge
+        visible = max(1, self.scrollable_content_region.height - 1)
+        if row < self.scroll_y:
+            self.scroll_to(y=row, animate=False, immediate=True)
+        elif row >= self.scroll_y + visible:
+            self.scroll_to(y=row - visible + 1, animate=False, immediate=True)
+        self.refresh()
+        self._post_highlighted()
+
+    def _post_highlighted(self) -> None:
+        task_id = self.cursor_task_id
+        if task_id is not None and task_id != self._highlighted:
+            self._highlighted = task_id
+            self.post_message(self.RowHighlighted(task_id))
+
+    def action_cursor_up(self) -> None:
+        self.cursor_row -= 1
+
+    def action_cursor_down(self) -> None:
+        self.cursor_row += 1
+
+    def action_page_up(self) -> None:
+        self.cursor_row -= max(1, self.scrollable_content_region.height - 1)
+
+    def action_page_down(self) -> None:
+        self.cursor_row += max(1, self.scrollable_content_region.height - 1)
+
+    def action_cursor_home(self) -> None:
+        self.cursor_row = 0
+
+    def action_cursor_end(self) -> None:
+        self.cursor_row = len(self.task_ids) - 1
+
+    def on_click(self, event: events.Click) -> None:
+        offset = event.get_content_offset(self)
+        if offset is None:
+            return
+        if offset.y == 0:
+            # Sort by the clicked column
+            x = offset.x + self.scroll_x
+            for field, width in self.COLUMN_WIDTHS.items():
+                x -= width + 1
+                if x < 0:
+                    if field in SortFields:
+                        self.set_sort(cast(SortFieldsT, field))
+                    return
+            return
+        row = int(self.scroll_y) + offset.y - 1
+        if row < len(self.task_ids):
+            self.cursor_row = row
+
+    def _format_line(self, cells: list[Text]) -> Strip:
+        line = Text(" ")
+        for cell, width in zip(cells, self.COLUMN_WIDTHS.values()):
+            cell.truncate(width, overflow="ellipsis", pad=True)
+            line.append_text(cell)
+            line.append(" ")
+        return Strip(line.render(self.app.console))
+
+    def _render_row(self, task_id: str) -> Strip:
+        strip = self._row_cache.get(task_id)
+        if strip is None:
+            id_, status, created, message = self._row_values(self.tasks[task_id])
+            strip = self._format_line(
+                [Text(id_), Text.from_markup(status), Text(created), Text(message)]
+            )
+            self._row_cache[task_id] = strip
+        return strip
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.scrollable_content_region.width
+        if y == 0:
+            strip = self._format_line([Text(label) for label in self.COLUMNS.values()])
+            style = self.get_component_rich_style("virtual-task-table--header")
+        else:
+            row = scroll_y + y - 1
+            if row >= len(self.task_ids):
+                return Strip.blank(width, self.rich_style)
+            strip = self._render_row(self.task_ids[row])
+            if row == self.cursor_row:
+                style = self.get_component_rich_style("virtual-task-table--cursor")
+            elif row % 2:
+                style = self.get_component_rich_style("virtual-task-table--even-row")
+            else:
+                style = Style()
+        return (
+            strip.crop_extend(scroll_x, scroll_x + width, None)
+            .apply_style(style)
+            .apply_style(self.rich_style)
+        )
+
 
 class DependencyTree(Tree):
-    """Tree widget for displaying task dependencies."""
+    """Tree widget for displaying task dependencies.
+
+    Dependency nodes are created when their parent is expanded and dropped
+    when it is collapsed, so only the visible part of the graph is built.
+    """
 
     def __init__(self, tasks: TaskList, root_task_id: str | None = None):
         super().__init__("Tasks")
@@ -171,6 +508,7 @@ class DependencyTree(Tree):
         self.root_task_id = root_task_id
         self._build_tree()
 
+    @timed
     def _build_tree(self):
         """Build the dependency tree."""
         # Clear existing tree
@@ -178,15 +516,12 @@ class DependencyTree(Tree):
 
         if self.root_task_id and self.root_task_id in self.tasks:
             # Build tree starting from specific task
-            self._add_task_node(self.root, self.root_task_id)
+            node = self._add_task_node(self.root, self.root_task_id)
+            self._expand_task_node(node)
         else:
             # Group tasks by their root (tasks with no dependencies pointing to them)
-            dependents = set()
-            for task in self.tasks.values():
-                dependents.update(task.dependencies)
-
-            root_tasks = [tid for tid in self.tasks.keys() if tid not in dependents]
-            root_tasks.sort()
+            graph = self.tasks.dependency_graph
+            root_tasks = sorted(graph.ids[i] for i in graph.roots())
 
             if not root_tasks:
                 # Handle case where there are cycles - just show all tasks
@@ -195,26 +530,76 @@ class DependencyTree(Tree):
             for root_id in root_tasks:
                 self._add_task_node(self.root, root_id)
 
-    def _add_task_node(self, parent_node, task_id: str):
-        """Add a task node to the tree."""
+    def _task_label(self, task_id: str) -> tuple[str, bool]:
+        """Get the label of a task node and whether it can be expanded."""
         if task_id not in self.tasks:
-            node = parent_node.add(f"{task_id} [not found]")
-            node.allow_expand = False
-            return
-
+            return f"{task_id} [not found]", False
         task = self.tasks[task_id]
         state = self.tasks.get_task_state(task)
-        node = parent_node.add(f"{task_id}: {task.message} [{state}]")
+        return f"{task_id}: {task.message} [{state}]", bool(task.dependencies)
+
+    def _add_task_node(self, parent_node: TreeNode, task_id: str) -> TreeNode:
+        """Add a collapsed task node to the tree."""
+        label, allow_expand = self._task_label(task_id)
+        return parent_node.add(label, data=task_id, allow_expand=allow_expand)
 
-        # Add dependency nodes
+    def update_task_nodes(self, task_ids: set[str]) -> None:
+        """Update the nodes of changed tasks and of their direct dependents.
+
+        Expanded nodes of changed tasks get their dependency nodes re-created,
+        the rest of the tree is left untouched.
+        """
+        if self.root_task_id not in self.tasks:
+            self._build_tree()
+            return
+        affected = set(task_ids)
+        for task_id in task_ids:
+            affected.update(self.tasks.get_dependents(task_id))
+        stack = list(self.root.children)
+        while stack:
+            node = stack.pop()
+            if node.data in affected:
+                label, allow_expand = self._task_label(node.data)
+                node.set_label(label)
+                node.allow_expand = allow_expand
+                if node.data in task_ids:
+                    node.remove_children()
+                    if node.is_expanded:
+                        self._populate_task_node(node)
+            stack.extend(node.children)
+
+    def _populate_task_node(self, node: TreeNode) -> None:
+        """Create the dependency nodes of a task node if missing."""
+        task = self.tasks.get(node.data) if node.data is not None else None
+        if task is None or node.children:
+            return
         for dep_id in task.dependencies:
             self._add_task_node(node, dep_id)
 
-        node.allow_expand = bool(task.dependencies)
-        # Expand the node if it has dependencies
-        if task.dependencies:
+    def _expand_task_node(self, node: TreeNode) -> None:
+        """Populate and expand a task node."""
+        self._populate_task_node(node)
+        if node.allow_expand:
             node.expand()
 
+    def on_tree_node_expanded(self, event: Tree.NodeExpanded) -> None:
+        self._populate_task_node(event.node)
+
+    def on_tree_node_collapsed(self, event: Tree.NodeCollapsed) -> None:
+        if event.node.data is not None:
+            event.node.remove_children()
+
+
+class TasksFileChanged(Message):
+    """Posted by the file watcher when the todos file was changed on disk."""
+
+    def __init__(self, tasks: TaskList, signature: FileSignature | None):
+        super().__init__()
+        # Parsed in the watcher thread, compared to the in-memory tasks in the
+        # UI thread where they cannot change meanwhile
+        self.tasks = tasks
+        self.signature = signature
+
 
 # TODO: prio low: this class does display two things and has to be refactored. create OrderDetails. Put both into parent container and swap the widget
 class TaskDetails(Static):
@@ -240,6 +625,7 @@ class TaskDetails(Static):
         self.order_list = order_list
         self.refresh()
 
+    @timed
     def render(self):
         """Render the task details."""
         if self.showing_order:
@@ -281,9 +667,7 @@ class TaskDetails(Static):
             details += "  None\n"
 
         details += "\n[bold red]Blocks:[/bold red]\n"
-        dependents = tuple(
-            tid for tid, t in self.tasks.items() if self.task_id in t.dependencies
-        )
+        dependents = self.tasks.get_dependents(self.task_id)
         if dependents:
             for dep_id in dependents:
                 dep_task = self.tasks.get(dep_id)
@@ -416,8 +800,10 @@ class UpdateTaskModal(BaseModalScreen):
         super().__init__()
         self.task_id = task_id
 
-    def _get_dependency_options(self) -> list[Selection[str]]:
+    def _get_dependency_options(self) -> list["Selection[str]"]:
         """Get available tasks for dependency selection."""
+        from textual.widgets.selection_list import Selection
+
         app = cast(DependentTodosApp, self.app)
         options = []
         current_deps = app.tasks[self.task_id].dependencies
@@ -438,9 +824,7 @@ class UpdateTaskModal(BaseModalScreen):
     def _get_depending_on_text(self) -> str:
         """Get text for tasks that depend on this task."""
         app = cast(DependentTodosApp, self.app)
-        dependents = [
-            tid for tid, t in app.tasks.items() if self.task_id in t.dependencies
-        ]
+        dependents = app.tasks.get_dependents(self.task_id)
         if not dependents:
             return "None"
         dependent_texts = []
@@ -451,6 +835,8 @@ class UpdateTaskModal(BaseModalScreen):
         return "\n".join(dependent_texts)
 
     def get_content(self) -> ComposeResult:
+        from textual.widgets import SelectionList, TextArea
+
         app = cast(DependentTodosApp, self.app)
         task = app.tasks.get(self.task_id)
         if not task:
@@ -466,10 +852,10 @@ class UpdateTaskModal(BaseModalScreen):
         yield Static(self._get_depending_on_text(), classes="depending-on-list")
 
     def on_mount(self) -> None:
-        self.query_one(".task-message", TextArea).focus()
+        self.query_one(".task-message").focus()
 
     def on_ok_pressed(self) -> None:
-        message = self.query_one(".task-message", TextArea).text
+        message = cast("TextArea", self.query_one(".task-message")).text
         if not message.strip():
             self.notify("Task message cannot be empty")
             return
@@ -482,7 +868,7 @@ class UpdateTaskModal(BaseModalScreen):
             return
 
         # Get selected dependencies
-        selection_list = self.query_one("#depends-on", SelectionList)
+        selection_list = cast("SelectionList[str]", self.query_one("#depends-on"))
         selected_deps = list(selection_list.selected)
 
         # Validate for circular dependencies
@@ -490,9 +876,7 @@ class UpdateTaskModal(BaseModalScreen):
             self.task_id, selected_deps
         )
         if circular_deps:
-            self.notify(
-                f"Circular dependency detected with: {', '.join(circular_deps)}"
-            )
+            self.notify(f"Circular dependency detected: {' → '.join(circular_deps)}")
             return
 
         task.message = message
@@ -535,8 +919,10 @@ class AddTaskModal(BaseModalScreen):
 
     TITLE = "Add a new task"
 
-    def _get_dependency_options(self) -> list[Selection[str]]:
+    def _get_dependency_options(self) -> list["Selection[str]"]:
         """Get available tasks for dependency selection."""
+        from textual.widgets.selection_list import Selection
+
         app = cast(DependentTodosApp, self.app)
         options = []
         for task_id, task in app.tasks.items():
@@ -548,6 +934,8 @@ class AddTaskModal(BaseModalScreen):
         return options
 
     def get_content(self) -> ComposeResult:
+        from textual.widgets import Input, SelectionList, TextArea
+
         yield Input("", classes="task-id", placeholder="Task ID", disabled=True)
         yield TextArea(placeholder="Task message", classes="task-message")
         yield Static("Depends on:", classes="depends-on-label")
@@ -556,18 +944,18 @@ class AddTaskModal(BaseModalScreen):
         )
 
     def on_mount(self) -> None:
-        self.query_one(".task-message", TextArea).focus()
+        self.query_one(".task-message").focus()
 
-    def on_text_area_changed(self, event: TextArea.Changed) -> None:
+    def on_text_area_changed(self, event: "TextArea.Changed") -> None:
         message = event.text_area.text
         app = cast(DependentTodosApp, self.app)
         existing_ids = set(app.tasks.keys())
         task_id = generate_unique_id(message, existing_ids)
-        inp = self.query_one(".task-id", Input)
+        inp = cast("Input", self.query_one(".task-id"))
         inp.value = task_id
 
     def on_ok_pressed(self) -> None:
-        message = self.query_one(".task-message", TextArea).text
+        message = cast("TextArea", self.query_one(".task-message")).text
 
         if not message.strip():
             self.notify("Task message cannot be empty")
@@ -578,15 +966,13 @@ class AddTaskModal(BaseModalScreen):
         task_id = generate_unique_id(message, existing_ids)
 
         # Get selected dependencies
-        selection_list = self.query_one("#depends-on", SelectionList)
+        selection_list = cast("SelectionList[str]", self.query_one("#depends-on"))
         selected_deps = list(selection_list.selected)
 
         # Validate for circular dependencies
         circular_deps = app.tasks.detect_circular_dependencies(task_id, selected_deps)
         if circular_deps:
-            self.notify(
-                f"Circular dependency detected with: {', '.join(circular_deps)}"
-            )
+            self.notify(f"Circular dependency detected: {' → '.join(circular_deps)}")
             return
 
         task = Task(
@@ -621,6 +1007,10 @@ class DependentTodosApp(App):
 
     # TODO: Do the same for the other ids of the main widgets used and use the class variables inside the functions
     SIDEBAR_WIDGET_ID = "sidebar"
+    # Changes within this many seconds are written to the file at once
+    SAVE_DELAY = 0.5
+    # From this many tasks on only the visible rows of the table are rendered
+    VIRTUAL_TABLE_MIN_TASKS = 5000
 
     FILTER_EXPLANATIONS = {
         "Doing": "Tasks that have been started",
@@ -631,13 +1021,31 @@ class DependentTodosApp(App):
         "Cancelled": "Cancelled tasks",
     }
 
-    def __init__(self, config_path: str | None = None):
+    def __init__(
+        self,
+        config_path: str | None = None,
+        validate: bool = False,
+        virtual_table: bool | None = None,
+    ):
         super().__init__()
         self.config_path = get_config_path(config_path)
-        self.tasks = cast(TaskList, load_tasks_from_file(self.config_path))
+        self._storage = get_storage(self.config_path, validate=validate)
+        with span("load tasks"):
+            self.tasks = cast(TaskList, self._storage.load())
+        # Signature of the file content self.tasks was loaded from or saved to
+        self._file_signature = file_signature(self.config_path)
+        self._saver = WriteBehindSaver(
+            self._storage,
+            on_saved=self._on_file_saved,
+            on_error=self._on_save_error,
+        )
+        self._save_timer: Timer | None = None
         self.current_task_id = None
         self.current_filter: TabFilterType = "Doing"
         self.footer = f"Config: {self.config_path}"
+        if virtual_table is None:
+            virtual_table = len(self.tasks) >= self.VIRTUAL_TABLE_MIN_TASKS
+        self.virtual_table = virtual_table
 
     def compose(self) -> ComposeResult:
         """Compose the UI."""
@@ -649,12 +1057,17 @@ class DependentTodosApp(App):
             yield tree
         with Container(id="main-content"):
             yield FocusableTabs(id="filter-tabs")
-            yield TaskTable(
-                self.tasks,
-                filter_state=self.current_filter,
-                id="task-table",
-                cursor_type="row",
-            )
+            if self.virtual_table:
+                yield VirtualTaskTable(
+                    self.tasks, filter_state=self.current_filter, id="task-table"
+                )
+            else:
+                yield TaskTable(
+                    self.tasks,
+                    filter_state=self.current_filter,
+                    id="task-table",
+                    cursor_type="row",
+                )
             yield Static("", id="filter-info")
             yield TaskDetails(id="task-details")
             yield Static(self.footer, id="info-bar")
@@ -665,19 +1078,56 @@ class DependentTodosApp(App):
         sidebar = self.sidebar
         sidebar.display = False
         self.task_table.focus()
+        self._watcher = FileWatcher(
+            self.config_path, self._on_file_changed, on_error=self._on_watch_error
+        )
+        self._watcher.start()
+
+    def on_unmount(self) -> None:
+        self._watcher.stop()
+        self._flush_save()
+        self._saver.close()
+
+    def _on_file_changed(self, signature: FileSignature | None) -> None:
+        """Parse a changed file and post the differences (watcher thread)."""
+        if signature == self._file_signature or self._save_pending:
+            # Written by ourselves, or about to be overwritten by us
+            return
+        try:
+            tasks = self._storage.load()
+        except Exception as e:
+            self.notify(f"Error loading tasks: {e}", severity="error")
+            return
+        self.post_message(TasksFileChanged(tasks, signature))
+
+    @on(TasksFileChanged)
+    def handle_tasks_file_changed(self, event: TasksFileChanged) -> None:
+        """Merge changes made to the file by another process."""
+        if self._save_pending:
+            return
+        diff = self.tasks.diff(event.tasks)
+        self._apply_file_change(event.tasks, diff, event.signature)
 
     @property
-    def task_table(self) -> TaskTable:
-        return self.query_one("#task-table", TaskTable)
+    def task_table(self) -> TaskTable | VirtualTaskTable:
+        return cast(TaskTable | VirtualTaskTable, self.query_one("#task-table"))
 
     @on(DataTable.RowHighlighted)
     def handle_data_table_row_selected(self, event: DataTable.RowHighlighted) -> None:
         """Handle task selection in the table."""
-        table = self.task_table
         row_key = event.row_key
         if row_key is None:
             return
-        task_id = table.get_row(row_key)[0]
+        self._select_task(event.data_table.get_row(row_key)[0])
+
+    @on(VirtualTaskTable.RowHighlighted)
+    def handle_virtual_table_row_highlighted(
+        self, event: VirtualTaskTable.RowHighlighted
+    ) -> None:
+        """Handle task selection in the virtualized table."""
+        self._select_task(event.task_id)
+
+    def _select_task(self, task_id: str) -> None:
         self.current_task_id = task_id
         details = self.task_details
         details.update_task(task_id, self.tasks)
@@ -711,9 +1161,8 @@ class DependentTodosApp(App):
         tree = self.dep_tree
         if event.node == tree.root:
             return
-        label = str(event.node.label)
-        task_id = label.split(":")[0].strip()
-        if task_id in self.tasks:
+        task_id = event.node.data
+        if isinstance(task_id, str) and task_id in self.tasks:
             self.current_task_id = task_id
             details = self.task_details
             details.update_task(task_id, self.tasks)
@@ -747,12 +1196,13 @@ class DependentTodosApp(App):
     def action_mark_done(self) -> None:
         """Mark the selected task as done."""
         if self.current_task_id:
-            task = self.tasks.get(self.current_task_id)
-            if task:
-                task.status = "done"
-                task.completed = datetime.now()
+            if self.current_task_id in self.tasks:
+                unblocked = self.tasks.mark_done(self.current_task_id)
                 self._save_and_refresh()
-                self.notify(f"Task '{self.current_task_id}' marked as done")
+                message = f"Task '{self.current_task_id}' marked as done"
+                if unblocked:
+                    message += f"\nUnblocked: {', '.join(sorted(unblocked))}"
+                self.notify(message)
             else:
                 self.notify("Task not found")
         else:
@@ -775,33 +1225,90 @@ class DependentTodosApp(App):
         else:
             self.notify("No task selected")
 
+    @timed
     def _save_and_refresh(self) -> None:
-        """Save tasks to file and refresh the UI."""
+        """Schedule saving tasks to file and refresh the UI.
+
+        The in-memory tasks are the source of truth, the file is not read back.
+        Saves are delayed by SAVE_DELAY to write bursts of changes at once.
+        """
+        if self._save_timer is None:
+            self._save_timer = self.set_timer(self.SAVE_DELAY, self._flush_save)
+        self._refresh_views()
+        # Refresh tree if display
+        sidebar = self.sidebar
+        if sidebar.display:
+            tree = self.dep_tree
+            tree.tasks = self.tasks
+            tree._build_tree()
+            tree.refresh()
+
+    @property
+    def _save_pending(self) -> bool:
+        return self._save_timer is not None or self._saver.pending
+
+    def _flush_save(self) -> None:
+        """Hand the scheduled save to the background writer."""
+        if self._save_timer is None:
+            return
+        self._save_timer.stop()
+        self._save_timer = None
         try:
-            save_tasks_to_file(self.tasks, self.config_path)
-            self.action_refresh()
-            # Refresh tree if display
-            sidebar = self.sidebar
-            if sidebar.display:
-                tree = self.dep_tree
-                tree.tasks = self.tasks
-                tree._build_tree()
-                tree.refresh()
+            self._saver.submit(self.tasks)
         except Exception as e:
             self.notify(f"Error saving tasks: {e}", severity="error")
 
+    def _on_file_saved(self, signature: FileSignature | None) -> None:
+        """Remember our own write so the watcher ignores it (writer thread)."""
+        self._file_signature = signature
+
+    def _on_watch_error(self, error: Exception) -> None:
+        self.notify(f"Error reading tasks: {error}", severity="error")
+
+    def _on_save_error(self, error: Exception) -> None:
+        self.notify(f"Error saving tasks: {error}", severity="error")
+
+    @timed
     def action_refresh(self) -> None:
-        """Refresh the task data."""
+        """Refresh the task data, reloading the file if it changed on disk."""
         try:
-            self.tasks = load_tasks_from_file(self.config_path)
-            table = self.task_table
-            table.refresh_data(self.tasks)
-            details = self.task_details
-            details.tasks = self.tasks
-            details.refresh()
+            # Our own pending changes go to disk first
+            self._flush_save()
+            self._saver.flush()
+            signature = file_signature(self.config_path)
+            if signature != self._file_signature:
+                tasks = self._storage.load()
+                self._apply_file_change(tasks, self.tasks.diff(tasks), signature)
+            self._refresh_views()
         except Exception as e:
             self.notify(f"Error loading tasks: {e}", severity="error")
 
+    def _apply_file_change(
+        self, tasks: TaskList, diff: TaskListDiff, signature: FileSignature | None
+    ) -> None:
+        """Update the in-memory tasks and the affected widgets from a reload."""
+        self._file_signature = signature
+        if not diff:
+            return
+        self.tasks.apply_diff(tasks, diff)
+        # The merged changes are on disk already, do not save them again
+        self.tasks.pop_changes()
+        if self.current_task_id in diff.removed:
+            self.current_task_id = None
+        self._refresh_views()
+        if self.sidebar.display:
+            tree = self.dep_tree
+            tree.tasks = self.tasks
+            tree.update_task_nodes(diff.task_ids)
+
+    def _refresh_views(self) -> None:
+        """Show the current in-memory tasks in the table and details."""
+        table = self.task_table
+        table.refresh_data(self.tasks)
+        details = self.task_details
+        details.tasks = self.tasks
+        details.refresh()
+
     def action_show_ready(self) -> None:
         """Show ready tasks."""
         ready_tasks = self.tasks.get_pending_tasks()
@@ -834,7 +1341,6 @@ class DependentTodosApp(App):
                 tree.root_task_id = self.current_task_id
                 tree._build_tree()
                 tree.refresh()
-                tree.root.expand_all()
             else:
                 self.notify("No task selected")
         else:
@@ -862,8 +1368,12 @@ class DependentTodosApp(App):
                 tree.refresh(recompose=True)
 
 
-def run():
-    """Run the Textual TUI application."""
+def run(argv: list[str] | None = None):
+    """Run the Textual TUI application.
+
+    Args:
+        argv: Command line arguments, defaults to sys.argv
+    """
     parser = argparse.ArgumentParser(description="Run the Dependent Todos TUI")
     parser.add_argument(
         "--config",
@@ -871,9 +1381,44 @@ def run():
         help="Path to configuration file (default: %(default)s)",
         default=TODOS_CONFIG_NAME,
     )
-    args = parser.parse_args()
-    app = DependentTodosApp(config_path=args.config)
-    app.run()
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Validate all tasks on load, even if the file was written by this tool",
+    )
+    parser.add_argument(
+        "--virtual-table",
+        action="store_true",
+        default=None,
+        help="Only render the visible rows of the task table, the default for "
+        "large task lists",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the session and write a report to the working directory on exit",
+    )
+    args = parser.parse_args(argv)
+    profiler = Profiler() if args.profile else None
+    with profiler or nullcontext():
+        app = DependentTodosApp(
+            config_path=args.config,
+            validate=args.validate,
+            virtual_table=args.virtual_table,
+        )
+        app.run()
+    if profiler is not None:
+        report_path = default_report_path()
+        profiler.write_report(
+            report_path,
+            {
+                "Config": app.config_path,
+                "Storage": type(app._storage).__name__,
+                "Tasks": len(app.tasks),
+                "Virtual table": app.virtual_table,
+            },
+        )
+        print(f"Profile written to {report_path.resolve()}")
 
 
 if __name__ == "__main__":
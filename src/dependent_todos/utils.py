@@ -1,6 +1,12 @@
 """Utility functions for the dependent todos application."""
 
+import gc
+import os
 import re
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
 
 from dependent_todos.constants import TASK_ID_MAX_LEN
 from dependent_todos.constants import (
@@ -139,3 +145,86 @@ def truncate(message: str):
     if len(message) > MAX_MESSAGE_DISPLAY_LENGTH:
         message = message[:MESSAGE_TRUNCATE_LENGTH] + TRUNCATION_SUFFIX
     return message
+
+
+def _get_umask() -> int:
+    # Reading the umask means setting it, done once at import to not race
+    # with threads creating files
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+UMASK = _get_umask()
+
+
+def atomic_write(
+    file_path: Path, data: bytes, durable: bool = True, mode: int | None = None
+) -> os.stat_result:
+    """Replace the content of a file atomically.
+
+    The data is written to a temporary file next to the target, flushed to
+    disk and renamed over the target, so neither readers nor a crash can
+    observe a partially written file.
+
+    Args:
+        file_path: Path of the file to write
+        data: New content of the file
+        durable: Flush the file and the rename to disk, can be skipped for
+            files that are cheap to recreate
+        mode: Permission bits of the file, by default those of the replaced
+            file or the ones open() would give a new file
+
+    Returns:
+        Status of the written file taken before the rename, so it describes
+        this content even if the file is replaced again right after
+    """
+    fd, tmp_name = tempfile.mkstemp(
+        dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        if mode is None:
+            try:
+                mode = file_path.stat().st_mode & 0o7777
+            except FileNotFoundError:
+                # The mode open() would give a new file
+                mode = 0o666 & ~UMASK
+        os.chmod(tmp_name, mode)
+        # Renaming keeps the modification time and size
+        stat = os.stat(tmp_name)
+        os.replace(tmp_name, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    # Persist the rename itself
+    if durable and hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(file_path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    return stat
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """Pause the cyclic garbage collector while building many objects.
+
+    Every few hundred allocations the collector runs and, with a large heap,
+    keeps traversing objects that are not garbage.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
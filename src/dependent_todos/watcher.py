@@ -0,0 +1,155 @@
+"""Background watching of the todos file for changes made by other processes."""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from dependent_todos.storage import FileSignature, file_signature
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+INOTIFY_EVENT = struct.Struct("iIII")
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+
+class _Inotify:
+    """Minimal inotify binding watching the directory of a file."""
+
+    def __init__(self, file_path: Path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Watch the directory, editors and atomic saves replace the file
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(file_path.parent), WATCH_MASK)
+        if wd < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+        self.name = os.fsencode(file_path.name)
+
+    def wait(self, timeout: float) -> bool:
+        """Wait for events, returns True if one of them concerns the file."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        offset = 0
+        touched = False
+        while offset < len(data):
+            _, _, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            touched = touched or name == self.name
+        return touched
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """Report changes of a file from a background thread.
+
+    Uses inotify where available and falls back to polling the modification
+    time and size. Bursts of changes are debounced: the callback runs once
+    the file has been quiet for `debounce` seconds and its signature differs
+    from the last reported one. An exception raised by the callback is
+    passed to on_error and does not end watching.
+    """
+
+    def __init__(
+        self,
+        file_path: Path,
+        on_change: Callable[[FileSignature | None], None],
+        debounce: float = 0.3,
+        poll_interval: float = 1.0,
+        use_inotify: bool = True,
+        on_error: Callable[[Exception], None] | None = None,
+    ):
+        self.file_path = file_path
+        self.on_change = on_change
+        self.on_error = on_error
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify and sys.platform.startswith("linux")
+        self.signature = file_signature(file_path)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        # Set up inotify before returning so no change after start() is missed
+        inotify = None
+        if self.use_inotify:
+            try:
+                inotify = _Inotify(self.file_path)
+            except OSError:
+                inotify = None
+        self._thread = threading.Thread(
+            target=self._run, args=(inotify,), name="todos-file-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _run(self, inotify: _Inotify | None) -> None:
+        try:
+            self._watch(inotify)
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def _wait(self, inotify: _Inotify | None, timeout: float) -> bool:
+        """Wait up to timeout, returns True if the file may have changed."""
+        if inotify is not None:
+            return inotify.wait(timeout)
+        self._stop.wait(timeout)
+        return file_signature(self.file_path) != self.signature
+
+    def _watch(self, inotify: _Inotify | None) -> None:
+        # Inotify waits are kept short so a stop request is noticed quickly
+        interval = 0.2 if inotify is not None else self.poll_interval
+        while not self._stop.is_set():
+            if not self._wait(inotify, interval):
+                continue
+            # Debounce: wait until no further change arrives
+            quiet_since = time.monotonic()
+            while not self._stop.is_set():
+                timeout = self.debounce - (time.monotonic() - quiet_since)
+                if timeout <= 0:
+                    break
+                if inotify is not None:
+                    if inotify.wait(timeout):
+                        quiet_since = time.monotonic()
+                else:
+                    signature = file_signature(self.file_path)
+                    self._stop.wait(timeout)
+                    if file_signature(self.file_path) != signature:
+                        quiet_since = time.monotonic()
+            signature = file_signature(self.file_path)
+            if signature != self.signature and not self._stop.is_set():
+                self.signature = signature
+                try:
+                    self.on_change(signature)
+                except Exception as e:
+                    if self.on_error is not None:
+                        self.on_error(e)
@@ -0,0 +1,117 @@
+"""Tests for the sidecar cache of task files."""
+
+import os
+
+import pytest
+from pydantic import ValidationError
+
+from dependent_todos.cache import cache_key, cache_path, read_cache, write_cache
+from dependent_todos.models import Task, TaskList
+from dependent_todos.utils import atomic_write
+
+
+def _write_tasks(path, *messages):
+    tasks = TaskList()
+    for i, message in enumerate(messages):
+        tasks[f"task-{i}"] = Task(id=f"task-{i}", message=message)
+    tasks.save_to_file(path)
+    return tasks
+
+
+def test_cache_written_on_save_and_used_on_load(tmp_path, monkeypatch):
+    """Test that a saved file is loaded from the cache without parsing."""
+    path = tmp_path / "todos.toml"
+    tasks = _write_tasks(path, "First", "Second")
+    assert cache_path(path).exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("TOML parsed despite matching cache")
+
+    monkeypatch.setattr("tomllib.load", fail)
+    loaded = TaskList.load_from_file(path)
+    assert loaded.model_dump() == tasks.model_dump()
+
+
+def test_cache_invalidated_by_file_change(tmp_path):
+    """Test that a changed file is parsed again and the cache refreshed."""
+    path = tmp_path / "todos.toml"
+    _write_tasks(path, "First")
+    stat = path.stat()
+    path.write_text(path.read_text().replace('"First"', '"Other"'), encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert read_cache(path) is None
+
+    assert TaskList.load_from_file(path)["task-0"].message == "Other"
+    cached = read_cache(path)
+    assert cached.data["task-0"]["message"] == "Other"
+    assert cached.validated
+
+
+def test_cache_keyed_by_written_content(tmp_path, monkeypatch):
+    """Test that a file replaced right after saving does not get its cache."""
+    path = tmp_path / "todos.toml"
+    _write_tasks(path, "First")
+
+    def write_then_replace(file_path, data, **kwargs):
+        stat = atomic_write(file_path, data, **kwargs)
+        file_path.write_text(file_path.read_text().replace("Second", "Other"))
+        return stat
+
+    monkeypatch.setattr("dependent_todos.models.atomic_write", write_then_replace)
+    _write_tasks(path, "First", "Second")
+    assert read_cache(path) is None
+    assert TaskList.load_from_file(path)["task-1"].message == "Other"
+
+
+def test_cache_has_file_mode(tmp_path):
+    """Test that the cache is as readable as the tasks file it mirrors."""
+    path = tmp_path / "todos.toml"
+    _write_tasks(path, "First")
+    path.chmod(0o600)
+    _write_tasks(path, "Second")
+    assert cache_path(path).stat().st_mode & 0o777 == 0o600
+
+
+def test_corrupt_cache_is_ignored(tmp_path):
+    """Test that an unreadable cache falls back to parsing the file."""
+    path = tmp_path / "todos.toml"
+    _write_tasks(path, "First")
+    cache_path(path).write_bytes(b"\x00garbage")
+    assert read_cache(path) is None
+    assert TaskList.load_from_file(path)["task-0"].message == "First"
+    assert read_cache(path) is not None
+
+
+def test_self_written_file_loaded_without_validation(tmp_path):
+    """Test that tasks from a trusted cache are validated on first edit."""
+    path = tmp_path / "todos.toml"
+    tasks = _write_tasks(path, "First", "Second")
+    tasks["task-1"].dependencies = ["task-0"]
+    tasks.mark_done("task-0")
+    tasks.save_to_file(path)
+
+    loaded = TaskList.load_from_file(path)
+    assert loaded.model_dump() == tasks.model_dump()
+    assert loaded.is_ready("task-1")
+    assert not loaded["task-0"]._validated
+    loaded["task-0"].message = "Changed"
+    assert loaded["task-0"]._validated
+    assert not loaded["task-1"]._validated
+
+    validated = TaskList.load_from_file(path, validate=True)
+    assert validated.model_dump() == tasks.model_dump()
+    assert validated["task-1"]._validated
+
+
+def test_invalid_trusted_task_fails_on_edit(tmp_path):
+    """Test that lazy validation catches invalid data in a trusted cache."""
+    path = tmp_path / "todos.toml"
+    _write_tasks(path, "First")
+    data = {"Bad Id": {"id": "Bad Id", "message": "Bad", "created": "2024-01-01"}}
+    write_cache(path, data, cache_key(path), validated=True)
+
+    loaded = TaskList.load_from_file(path)
+    with pytest.raises(ValidationError):
+        loaded["Bad Id"].message = "Changed"
+    # The file itself is fine
+    assert list(TaskList.load_from_file(path, validate=True).keys()) == ["task-0"]
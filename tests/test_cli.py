@@ -0,0 +1,64 @@
+"""Tests for the headless command line interface."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from dependent_todos.cli import main
+from dependent_todos.config import get_config_path
+from dependent_todos.storage import load_tasks_from_file
+
+
+def run_cli(capsys, *args: str) -> str:
+    main(list(args))
+    return capsys.readouterr().out
+
+
+def test_add_done_and_list(temp_dir, capsys):
+    """Test adding tasks, completing them and listing by tab filter."""
+    assert run_cli(capsys, "add", "Write docs") == "write-docs\tpending\tWrite docs\n"
+    run_cli(capsys, "add", "Release it", "--depends-on", "write-docs")
+
+    assert run_cli(capsys, "list", "blocked") == "release-it\tblocked\tRelease it\n"
+    assert run_cli(capsys, "ready") == "write-docs\tpending\tWrite docs\n"
+    assert [line.split("\t")[0] for line in run_cli(capsys, "order").splitlines()] == [
+        "write-docs",
+        "release-it",
+    ]
+    assert "└── write-docs" in run_cli(capsys, "tree", "release-it")
+
+    data = json.loads(run_cli(capsys, "done", "write-docs", "--json"))
+    assert data == {"id": "write-docs", "unblocked": ["release-it"]}
+    tasks = load_tasks_from_file(get_config_path())
+    assert tasks["write-docs"].status == "done"
+
+    run_cli(capsys, "cancel", "release-it")
+    listed = json.loads(run_cli(capsys, "list", "cancelled", "--json"))
+    assert [(t["id"], t["state"]) for t in listed] == [("release-it", "cancelled")]
+    run_cli(capsys, "cancel", "release-it", "--undo")
+    assert run_cli(capsys, "ready") == "release-it\tpending\tRelease it\n"
+
+    # Uncancelling a task that is not cancelled must not reopen it
+    with pytest.raises(SystemExit, match="'write-docs' is not cancelled"):
+        main(["cancel", "write-docs", "--undo"])
+    assert run_cli(capsys, "list", "done") == "write-docs\tdone\tWrite docs\n"
+
+
+def test_errors(temp_dir, capsys):
+    """Test that unknown tasks and cycles exit with an error."""
+    with pytest.raises(SystemExit, match="Task 'missing' not found"):
+        main(["done", "missing"])
+    with pytest.raises(SystemExit, match="not found"):
+        main(["add", "New task", "--depends-on", "missing"])
+    assert not get_config_path().exists()
+
+
+def test_does_not_import_textual(temp_dir):
+    """Test that subcommands do not import the TUI."""
+    code = (
+        "import sys; from dependent_todos.cli import main; main(['list']); "
+        "assert 'textual' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
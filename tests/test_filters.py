@@ -0,0 +1,58 @@
+"""Tests for the tab filters."""
+
+import random
+from datetime import datetime
+from typing import get_args
+
+from dependent_todos.filters import TabFilters, filter_ids, filter_tasks
+from dependent_todos.models import StatusT, Task, TaskList
+
+
+def baseline_matches(tasks: TaskList, task: Task, filter_state: str) -> bool:
+    """The tab predicates as originally written, checking every task."""
+    state = tasks.get_task_state(task)
+    return {
+        "Pending": task.pending,
+        "Doing": task.doing,
+        "Ready TODO": task.pending and state != "blocked",
+        "Blocked": not task.done and state == "blocked",
+        "Done": task.done,
+        "Cancelled": task.cancelled,
+    }[filter_state]
+
+
+def test_tabs_match_baseline_predicates():
+    """Test every tab against the predicates, including unusual field mixes."""
+    rng = random.Random(42)
+    now = datetime(2024, 1, 1)
+    tasks = TaskList()
+    for i in range(200):
+        tasks[f"t{i}"] = Task(
+            id=f"t{i}",
+            message=f"Task {i}",
+            status=rng.choice(get_args(StatusT)),
+            dependencies=[f"t{rng.randrange(i + 5)}" for _ in range(rng.randrange(3))],
+            created=now,
+            started=rng.choice([None, now]),
+            completed=rng.choice([None, now]),
+        )
+    # Cancelling and uncancelling a done task keeps its completed date
+    tasks.mark_done("t0")
+    tasks["t0"].cancelled = True
+    tasks["t0"].cancelled = False
+    assert "t0" in filter_ids(tasks, "Done")
+
+    for _ in range(3):
+        for filter_state in TabFilters:
+            expected = {
+                task.id
+                for task in tasks.values()
+                if baseline_matches(tasks, task, filter_state)
+            }
+            assert set(filter_ids(tasks, filter_state)) == expected, filter_state
+            assert {t.id for t in filter_tasks(tasks, filter_state)} == expected
+        # Edits update the state index the tabs are served from
+        for task_id in rng.sample(list(tasks.keys()), 20):
+            task = tasks[task_id]
+            task.status = rng.choice(get_args(StatusT))
+            task.completed = rng.choice([None, now])
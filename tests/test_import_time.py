@@ -0,0 +1,53 @@
+"""Tests keeping the import time of the package within budget."""
+
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative import time in microseconds as reported by -X importtime, a few
+# times what a warm import takes on a developer machine
+IMPORT_BUDGETS_US = {
+    "dependent_todos.models": 300_000,
+    "dependent_todos.cli": 350_000,
+}
+# Modules that must not be imported by loading and querying tasks
+LAZY_MODULES = ("textual", "rich", "tomli_w", "tomllib", "sqlite3")
+RUNS = 3
+
+
+def import_time_us(module: str) -> int:
+    """Get the cumulative import time of a module in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Lines look like "import time: <self> | <cumulative> | <module>"
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative)
+    raise AssertionError(f"{module} missing in importtime output")
+
+
+@pytest.mark.parametrize("module", IMPORT_BUDGETS_US)
+def test_import_time_budget(module):
+    """Test that importing a module stays within its budget."""
+    # The best of a few runs, the first one may populate the bytecode cache
+    best = min(import_time_us(module) for _ in range(RUNS))
+    assert best <= IMPORT_BUDGETS_US[module], (
+        f"importing {module} took {best} us, budget {IMPORT_BUDGETS_US[module]} us"
+    )
+
+
+@pytest.mark.parametrize("module", IMPORT_BUDGETS_US)
+def test_heavy_modules_imported_lazily(module):
+    """Test that modules only needed by some commands are not imported."""
+    code = f"import sys, {module}; print(' '.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    imported = set(result.stdout.split())
+    assert not imported.intersection(LAZY_MODULES)
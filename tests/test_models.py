@@ -1,8 +1,12 @@
 """Tests for dependency behavior and dependency trees in models.py."""
 
+import copy
+import pickle
+from datetime import datetime
+
 import pytest
 
-from dependent_todos.models import Task, TaskList
+from dependent_todos.models import MEMBERSHIPS, DependencyGraph, Task, TaskList
 
 
 @pytest.fixture
@@ -23,7 +27,19 @@ def test_circular_dependency_detection(sample_tasklist):
     # Adding a dependency that creates a cycle: task-a depends on task-c
     # This would create: task-a -> task-b -> task-c -> task-a
     cycle_deps = sample_tasklist.detect_circular_dependencies("task-a", ["task-c"])
-    assert cycle_deps == ["task-c"]
+    assert cycle_deps == ["task-a", "task-c", "task-b", "task-a"]
+
+    # Depending on itself is the shortest cycle
+    assert sample_tasklist.detect_circular_dependencies("task-a", ["task-a"]) == [
+        "task-a",
+        "task-a",
+    ]
+
+    # Dependencies that cannot reach the task are fine, missing ones included
+    assert (
+        sample_tasklist.detect_circular_dependencies("task-c", ["task-a", "missing"])
+        == []
+    )
 
 
 def test_topological_sort_with_dependencies(sample_tasklist):
@@ -64,3 +80,363 @@ def test_dependency_tree_visualization(sample_tasklist):
     assert lines[0].startswith("└── task-c:")
     assert "    └── task-b:" in lines[1]  # task-b is the only child of task-c
     assert "        └── task-a:" in lines[2]  # task-a is the only child of task-b
+
+
+def test_dependents_index_tracks_mutations(sample_tasklist):
+    """Test that the reverse dependency index follows adds, edits and deletes."""
+    assert sample_tasklist.get_dependents("task-a") == ["task-b"]
+    assert not sample_tasklist.has_dependents("task-c")
+
+    # Adding a task registers its dependencies
+    sample_tasklist["task-d"] = Task(
+        id="task-d", message="Task D", dependencies=["task-a", "task-c"]
+    )
+    assert sample_tasklist.get_dependents("task-a") == ["task-b", "task-d"]
+    assert sample_tasklist.get_dependents("task-c") == ["task-d"]
+
+    # Changing dependencies moves the task between entries
+    sample_tasklist["task-b"].dependencies = ["task-c"]
+    assert sample_tasklist.get_dependents("task-a") == ["task-d"]
+    assert sample_tasklist.get_dependents("task-c") == ["task-b", "task-d"]
+
+    # Deleting a task removes it from all entries
+    del sample_tasklist["task-d"]
+    assert sample_tasklist.get_dependents("task-a") == []
+    assert sample_tasklist.get_dependents("task-c") == ["task-b"]
+
+
+def test_equality_ignores_owner(sample_tasklist):
+    """Test that tasks and lists compare by their fields, not their owner."""
+    other = TaskList(
+        {task_id: task.model_copy() for task_id, task in sample_tasklist.items()}
+    )
+    assert other["task-a"] == sample_tasklist["task-a"]
+    assert other == sample_tasklist
+    other["task-a"].message = "Changed"
+    assert other != sample_tasklist
+
+
+def test_pickle_round_trip(sample_tasklist):
+    """Test that pickled tasks and lists load with working indexes."""
+    task = pickle.loads(pickle.dumps(sample_tasklist["task-a"]))
+    assert task == sample_tasklist["task-a"]
+
+    tasks = pickle.loads(pickle.dumps(sample_tasklist))
+    assert tasks == sample_tasklist
+    tasks["task-a"].done = True
+    assert tasks.is_ready("task-b")
+    assert not sample_tasklist.is_ready("task-b")
+
+
+def test_copies_do_not_update_original(sample_tasklist):
+    """Test that editing copies of tasks or lists leaves the original alone."""
+    task_copy = sample_tasklist["task-b"].model_copy()
+    task_copy.dependencies = []
+    assert sample_tasklist.get_dependents("task-a") == ["task-b"]
+    assert not sample_tasklist.is_ready("task-b")
+
+    tasks = copy.deepcopy(sample_tasklist)
+    tasks["task-b"].dependencies = []
+    assert tasks.get_dependents("task-a") == []
+    assert sample_tasklist.get_dependents("task-a") == ["task-b"]
+
+    tasks = copy.copy(sample_tasklist)
+    tasks["task-a"].done = True
+    assert tasks.is_ready("task-b")
+    assert sample_tasklist["task-a"].status == "pending"
+
+
+def test_dependents_index_built_on_load(tmp_path, sample_tasklist):
+    """Test that a loaded TaskList has its reverse dependency index built."""
+    path = tmp_path / "todos.toml"
+    sample_tasklist.save_to_file(path)
+    loaded = TaskList.load_from_file(path)
+    assert loaded.get_dependents("task-b") == ["task-c"]
+    assert loaded.get_dependents("task-c") == []
+
+
+def test_task_state_cache_invalidation(sample_tasklist):
+    """Test that cached states are dropped only for the affected tasks."""
+    states = {
+        tid: sample_tasklist.get_task_state(t) for tid, t in sample_tasklist.items()
+    }
+    assert states == {"task-a": "pending", "task-b": "blocked", "task-c": "blocked"}
+    assert sample_tasklist._task_states == states
+
+    # Completing task-a invalidates task-a and its direct dependent task-b only
+    sample_tasklist["task-a"].done = True
+    assert set(sample_tasklist._task_states) == {"task-c"}
+    assert sample_tasklist.get_task_state(sample_tasklist["task-a"]) == "done"
+    assert sample_tasklist.get_task_state(sample_tasklist["task-b"]) == "pending"
+    assert sample_tasklist.get_task_state(sample_tasklist["task-c"]) == "blocked"
+
+    # Dropping a dependency only invalidates the edited task
+    sample_tasklist["task-c"].dependencies = []
+    assert "task-c" not in sample_tasklist._task_states
+    assert sample_tasklist.get_task_state(sample_tasklist["task-c"]) == "pending"
+
+
+def test_task_state_cache_missing_dependency():
+    """Test that adding a missing dependency unblocks its dependents."""
+    tasks = TaskList()
+    tasks["task-b"] = Task(id="task-b", message="Task B", dependencies=["task-a"])
+    assert tasks.get_task_state(tasks["task-b"]) == "blocked"
+
+    tasks["task-a"] = Task(id="task-a", message="Task A")
+    assert tasks.get_task_state(tasks["task-b"]) == "blocked"
+    tasks["task-a"].done = True
+    assert tasks.get_task_state(tasks["task-b"]) == "pending"
+
+    del tasks["task-a"]
+    assert tasks.get_task_state(tasks["task-b"]) == "blocked"
+
+
+def test_blocker_counts(sample_tasklist):
+    """Test blocked/ready lookups and the tasks unblocked by completing one."""
+    assert sample_tasklist.is_ready("task-a")
+    assert sample_tasklist.is_blocked("task-b")
+    assert sample_tasklist.is_blocked("task-c")
+
+    assert sample_tasklist.mark_done("task-a") == {"task-b"}
+    assert not sample_tasklist.is_ready("task-a")
+    assert sample_tasklist.is_ready("task-b")
+    assert sample_tasklist.is_blocked("task-c")
+    assert sample_tasklist.get_pending_tasks() == ["task-b"]
+    # Completing an already done task unblocks nothing
+    assert sample_tasklist.mark_done("task-a") == set()
+
+    # Reopening and cancelling count the dependency as a blocker again
+    sample_tasklist["task-a"].done = False
+    assert sample_tasklist.is_blocked("task-b")
+    sample_tasklist["task-a"].done = True
+    sample_tasklist["task-a"].cancelled = True
+    assert sample_tasklist.is_blocked("task-b")
+
+    # Removing the blocking dependency unblocks the task
+    sample_tasklist["task-b"].dependencies = []
+    assert sample_tasklist.is_ready("task-b")
+
+    # Deleting a done dependency leaves a missing, blocking dependency
+    sample_tasklist.mark_done("task-b")
+    assert sample_tasklist.is_ready("task-c")
+    del sample_tasklist["task-b"]
+    assert sample_tasklist.is_blocked("task-c")
+
+
+def test_ready_matches_pending_state():
+    """Test that ready tasks are exactly those whose state is pending."""
+    now = datetime(2024, 1, 1)
+    tasks = TaskList()
+    tasks["stored"] = Task(id="stored", message="M", status="in-progress")
+    tasks["reopened"] = Task(
+        id="reopened", message="M", started=now, completed=now, created=now
+    )
+    tasks["started"] = Task(id="started", message="M", started=now)
+    for task in tasks.values():
+        expected = tasks.get_task_state(task) == "pending"
+        assert tasks.is_ready(task.id) == expected, task.id
+    assert tasks.get_pending_tasks() == ["reopened", "stored"]
+    assert tasks.tasks_in_state("ready") == {"reopened", "stored"}
+
+
+def test_topological_order_is_repaired_on_changes(sample_tasklist):
+    """Test that the maintained order follows added tasks and edited edges."""
+    # A task referenced before it exists is moved in front of its dependent
+    sample_tasklist["task-e"] = Task(
+        id="task-e", message="Task E", dependencies=["task-f"]
+    )
+    sample_tasklist["task-f"] = Task(id="task-f", message="Task F")
+    # Reversing the chain: task-a now depends on task-c's old dependents
+    sample_tasklist["task-c"].dependencies = []
+    sample_tasklist["task-a"].dependencies = ["task-c", "task-e"]
+
+    order = sample_tasklist.topological_sort()
+    assert sorted(order) == sorted(sample_tasklist.keys())
+    for task_id, task in sample_tasklist.items():
+        for dep_id in task.dependencies:
+            assert order.index(dep_id) < order.index(task_id)
+
+    # Done tasks are left out
+    sample_tasklist.mark_done("task-f")
+    assert "task-f" not in sample_tasklist.topological_sort()
+
+
+def test_topological_sort_with_cycle(sample_tasklist):
+    """Test that a cycle makes the order unavailable until it is broken."""
+    from graphlib import CycleError
+
+    sample_tasklist["task-a"].dependencies = ["task-c"]
+    with pytest.raises(CycleError):
+        sample_tasklist.topological_sort()
+
+    sample_tasklist["task-a"].dependencies = []
+    assert sample_tasklist.topological_sort() == ["task-a", "task-b", "task-c"]
+
+
+def test_dependency_tree_shared_subtrees():
+    """Test that shared dependencies are expanded once and limits apply."""
+    tasks = TaskList()
+    tasks["base"] = Task(id="base", message="Base")
+    tasks["left"] = Task(id="left", message="Left", dependencies=["base"])
+    tasks["right"] = Task(id="right", message="Right", dependencies=["base"])
+    tasks["top"] = Task(id="top", message="Top", dependencies=["left", "right"])
+    tasks["base"].dependencies = ["missing"]
+
+    lines = list(tasks.iter_dependency_tree("top"))
+    assert lines == [
+        "└── top: Top [blocked]",
+        "    ├── left: Left [blocked]",
+        "    │   └── base: Base [blocked]",
+        "    │       └── missing [not found]",
+        "    └── right: Right [blocked]",
+        "        └── base: Base [blocked] (see above)",
+    ]
+    assert tasks.get_dependency_tree("top") == "\n".join(lines) + "\n"
+
+    assert list(tasks.iter_dependency_tree("top", max_depth=1)) == [
+        "└── top: Top [blocked]",
+        "    ├── left: Left [blocked] (...)",
+        "    └── right: Right [blocked] (...)",
+    ]
+    assert list(tasks.iter_dependency_tree("top", max_nodes=2)) == [
+        "└── top: Top [blocked]",
+        "    ├── left: Left [blocked]",
+        "    │   └── ...",
+    ]
+
+
+def test_diff_and_apply(sample_tasklist):
+    """Test that a diff against a newer version updates the list in place."""
+    newer = TaskList.model_validate(sample_tasklist.model_dump())
+    assert not sample_tasklist.diff(newer)
+
+    del newer["task-a"]
+    newer["task-b"].message = "Task B changed"
+    newer["task-d"] = Task(id="task-d", message="Task D")
+    diff = sample_tasklist.diff(newer)
+    assert diff.added == ["task-d"]
+    assert diff.removed == ["task-a"]
+    assert diff.changed == ["task-b"]
+
+    sample_tasklist.apply_diff(newer, diff)
+    assert list(sample_tasklist.keys()) == ["task-b", "task-c", "task-d"]
+    assert sample_tasklist["task-b"].message == "Task B changed"
+    # Indexes follow the applied changes
+    assert sample_tasklist.get_dependents("task-b") == ["task-c"]
+    assert sample_tasklist.is_blocked("task-b")
+
+
+def test_compact_representation_on_load(tmp_path, sample_tasklist):
+    """Test that loaded tasks share id strings and fields sets safely."""
+    path = tmp_path / "todos.toml"
+    sample_tasklist.save_to_file(path)
+    for validate in (True, False):
+        tasks = TaskList.load_from_file(path, validate=validate)
+        dependent_id = tasks.get_dependents("task-a")[0]
+        assert tasks[dependent_id].dependencies[0] is tasks["task-a"].id
+
+        task_a, task_b = tasks["task-a"], tasks["task-b"]
+        assert task_a.model_fields_set is task_b.model_fields_set
+        for deep in (False, True):
+            copied = task_a.model_copy(update={"message": "Copied"}, deep=deep)
+            assert copied.message == "Copied"
+        assert task_a.model_fields_set is task_b.model_fields_set
+        assert task_a.message == "Task A"
+        task_a.message = "Changed"
+        assert "message" in task_a.model_fields_set
+        assert task_a.model_fields_set is not task_b.model_fields_set
+        assert tasks["task-a"].message == "Changed"
+
+
+def test_dependency_graph_csr(sample_tasklist):
+    """Test the integer graph including duplicate and missing dependencies."""
+    sample_tasklist["task-d"] = Task(
+        id="task-d",
+        message="Task D",
+        dependencies=["task-a", "task-missing", "task-a", "task-b"],
+    )
+    graph = sample_tasklist.dependency_graph
+    assert graph.ids == ["task-a", "task-b", "task-c", "task-d"]
+    a, b, c, d = range(4)
+    assert list(graph.dependencies_of(d)) == [a, b]
+    assert list(graph.dependencies_of(a)) == []
+    assert list(graph.dependents_of(a)) == [b, d]
+    assert list(graph.dependents_of(b)) == [c, d]
+    assert graph.topological_order() == [a, b, c, d]
+    assert graph.roots() == [c, d]
+    # Cached until the graph changes
+    assert sample_tasklist.dependency_graph is graph
+    sample_tasklist["task-a"].message = "Renamed"
+    assert sample_tasklist.dependency_graph is graph
+    sample_tasklist["task-a"].dependencies = ["task-c"]
+    assert sample_tasklist.dependency_graph is not graph
+    assert sample_tasklist.dependency_graph.topological_order() is None
+    assert DependencyGraph({}).topological_order() == []
+
+
+def test_cycle_through_task_not_added_yet(sample_tasklist):
+    """Test that a dangling dependency counts when the task is added."""
+    sample_tasklist["task-a"].dependencies = ["task-new"]
+    assert sample_tasklist.detect_circular_dependencies("task-new", ["task-c"]) == [
+        "task-new",
+        "task-c",
+        "task-b",
+        "task-a",
+        "task-new",
+    ]
+    assert sample_tasklist.detect_circular_dependencies("task-other", ["task-c"]) == []
+
+
+def test_state_membership_index(sample_tasklist):
+    """Test that the per-state task sets follow mutations."""
+    tasks = sample_tasklist
+
+    def expected(state):
+        if state == "ready":
+            return {tid for tid in tasks.keys() if tasks.is_ready(tid)}
+        return {tid for tid, t in tasks.items() if tasks.get_task_state(t) == state}
+
+    def check():
+        for state in MEMBERSHIPS:
+            assert tasks.tasks_in_state(state) == expected(state), state
+
+    check()
+    assert tasks.tasks_in_state("ready") == {"task-a"}
+    tasks.mark_done("task-a")
+    check()
+    assert tasks.tasks_in_state("blocked") == {"task-c"}
+    tasks["task-d"] = Task(id="task-d", message="Task D", dependencies=["task-c"])
+    tasks["task-b"].cancelled = True
+    check()
+    del tasks["task-c"]
+    tasks["task-d"].started = tasks["task-d"].created
+    check()
+    assert tasks.tasks_in_state("blocked") == {"task-d"}
+    tasks["task-d"].dependencies = []
+    check()
+    assert tasks.tasks_in_state("in-progress") == {"task-d"}
+    assert tasks.get_pending_tasks() == []
+
+
+def test_sorted_index_follows_mutations(sample_tasklist):
+    """Test that the per-field sorted indexes stay sorted and None-safe."""
+    tasks = sample_tasklist
+    assert tasks.sorted_ids("started") == ["task-a", "task-b", "task-c"]
+    assert tasks.sorted_ids("id", reverse=True) == ["task-c", "task-b", "task-a"]
+
+    tasks["task-c"].started = tasks["task-a"].created
+    tasks["task-b"].started = tasks["task-c"].created
+    assert tasks.sorted_ids("started") == ["task-c", "task-b", "task-a"]
+    assert tasks.sorted_ids("started", reverse=True) == ["task-b", "task-c", "task-a"]
+
+    tasks["task-0"] = Task(id="task-0", message="Task 0")
+    del tasks["task-c"]
+    tasks.mark_done("task-a")
+    assert tasks.sorted_ids("started") == ["task-b", "task-0", "task-a"]
+    assert tasks.sorted_ids("status") == ["task-a", "task-0", "task-b"]
+    assert tasks.sorted_ids("id") == ["task-0", "task-a", "task-b"]
+    for field in ("created", "started", "completed", "status", "id"):
+        values = [getattr(tasks[tid], field) for tid in tasks.sorted_ids(field)]
+        present = [value for value in values if value is not None]
+        assert present == sorted(present)
+        assert values[len(present) :] == [None] * (len(values) - len(present))
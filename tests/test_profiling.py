@@ -0,0 +1,48 @@
+"""Tests for profiling TUI sessions."""
+
+import pytest
+
+from dependent_todos.profiling import Profiler, span, timed
+from dependent_todos.tui import DependentTodosApp
+
+
+@timed
+def work(n: int) -> int:
+    return sum(range(n))
+
+
+def test_spans_recorded_while_active(tmp_path):
+    """Test that spans are only recorded while a profiler is entered."""
+    assert work(10) == 45
+    with Profiler() as profiler:
+        work(1000)
+        work(1000)
+        with span("block"):
+            pass
+    work(10)
+    assert len(profiler.spans["work"]) == 2
+    assert len(profiler.spans["block"]) == 1
+
+    report_path = tmp_path / "profile.txt"
+    profiler.write_report(report_path, {"Tasks": 3})
+    report = report_path.read_text()
+    assert "Tasks: 3" in report
+    assert "work" in report
+    assert "cumulative" in report
+    assert report_path.with_suffix(".prof").exists()
+
+
+@pytest.mark.asyncio
+async def test_tui_spans(temp_dir):
+    """Test that the hot TUI handlers are recorded as spans."""
+    with Profiler() as profiler:
+        app = DependentTodosApp()
+        async with app.run_test() as pilot:
+            await pilot.press("r")
+            await pilot.pause()
+    assert {
+        "load tasks",
+        "TaskTable._populate_table",
+        "TaskDetails.render",
+        "DependentTodosApp.action_refresh",
+    } <= set(profiler.spans)
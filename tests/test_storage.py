@@ -0,0 +1,220 @@
+"""Tests for the storage layer."""
+
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+import pytest
+
+from dependent_todos.journal import JournalStorage
+from dependent_todos.models import Task, TaskList
+from dependent_todos.sqlite import SqliteStorage
+from dependent_todos.storage import (
+    Storage,
+    TomlStorage,
+    WriteBehindSaver,
+    file_signature,
+    get_storage,
+)
+
+
+def test_write_behind_saver_writes_latest_snapshot(tmp_path):
+    """Test that submitted snapshots are written and reported."""
+    path = tmp_path / "todos.toml"
+    saved = []
+    saver = WriteBehindSaver(TomlStorage(path), on_saved=saved.append)
+    tasks = TaskList()
+    for i in range(5):
+        tasks[f"task-{i}"] = Task(id=f"task-{i}", message=f"Task {i}")
+        saver.submit(tasks)
+    # Changes after submit are not part of the snapshot
+    tasks["task-0"].message = "Changed later"
+    assert saver.flush(timeout=5)
+    assert not saver.pending
+
+    loaded = TaskList.load_from_file(path)
+    assert list(loaded.keys()) == [f"task-{i}" for i in range(5)]
+    assert loaded["task-0"].message == "Task 0"
+    assert saved[-1] == file_signature(path)
+    assert 1 <= len(saved) <= 5
+
+    saver.close()
+
+
+def test_write_behind_saver_reports_errors(tmp_path):
+    """Test that write errors are passed to the error callback."""
+    errors = []
+    storage = TomlStorage(tmp_path / "missing" / "todos.toml")
+    saver = WriteBehindSaver(storage, on_error=errors.append)
+    saver.submit(TaskList())
+    saver.close()
+    assert len(errors) == 1
+    assert isinstance(errors[0], FileNotFoundError)
+
+
+def test_get_storage_by_extension(tmp_path):
+    """Test that the storage backend is chosen by the file extension."""
+    assert isinstance(get_storage(tmp_path / "todos.toml"), TomlStorage)
+    assert isinstance(get_storage(tmp_path / "todos.journal"), JournalStorage)
+    assert isinstance(get_storage(tmp_path / "todos.db"), SqliteStorage)
+    assert isinstance(get_storage(tmp_path / "todos.sqlite"), SqliteStorage)
+    assert isinstance(get_storage(tmp_path / "todos.txt"), TomlStorage)
+    with pytest.raises(TypeError):
+        Storage(tmp_path / "todos.toml")  # type: ignore[abstract]
+
+
+@pytest.mark.parametrize("name", ["todos.journal", "todos.db"])
+def test_incremental_storage_rewrites_after_failed_write(tmp_path, name):
+    """Test that new tasks and tasks after a failed write are fully written."""
+    storage = get_storage(tmp_path / name)
+    tasks = TaskList()
+    tasks["a"] = Task(id="a", message="A")
+    assert tasks.storage_path is None
+    snapshot = storage.snapshot(tasks)
+    assert snapshot[0] == "full"
+    assert tasks.storage_path == storage.file_path
+    storage.write(snapshot)
+
+    # The change to b is lost with the failed write
+    tasks["b"] = Task(id="b", message="B")
+    assert storage.snapshot(tasks)[0] != "full"
+    with pytest.raises(TypeError):
+        storage.write(("update", ...))
+    snapshot = storage.snapshot(tasks)
+    assert snapshot[0] == "full"
+    storage.write(snapshot)
+    assert list(storage.load().keys()) == ["a", "b"]
+
+
+def test_sqlite_creates_schema_in_existing_database(tmp_path):
+    """Test that a database without the task tables gets them on first use."""
+    path = tmp_path / "todos.db"
+    with closing(sqlite3.connect(path)) as conn, conn:
+        conn.execute("CREATE TABLE other (id INTEGER)")
+    storage = SqliteStorage(path)
+    assert len(storage.load()) == 0
+    tasks = TaskList()
+    tasks["a"] = Task(id="a", message="A")
+    storage.write(storage.snapshot(tasks))
+    assert list(SqliteStorage(path).load().keys()) == ["a"]
+
+
+def test_journal_save_without_changes_before_first_write(tmp_path):
+    """Test that saving unchanged tasks does not need the journal to exist."""
+    storage = get_storage(tmp_path / "todos.journal")
+    tasks = storage.load()
+    storage.write(storage.snapshot(tasks))
+    assert len(storage.load()) == 0
+
+
+def _journal_lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_journal_appends_changes(tmp_path):
+    """Test that saves append operations which replay to the same tasks."""
+    path = tmp_path / "todos.journal"
+    storage = JournalStorage(path)
+    tasks = TaskList()
+    tasks["a"] = Task(id="a", message="A")
+    # Tasks not loaded from the journal are written as a snapshot
+    storage.write(storage.snapshot(tasks))
+    assert storage.snapshot_path.exists()
+    assert path.read_bytes() == b""
+
+    tasks["b"] = Task(id="b", message="B", dependencies=["a"])
+    tasks["a"].message = "A changed"
+    storage.write(storage.snapshot(tasks))
+    tasks.mark_done("a")
+    storage.write(storage.snapshot(tasks))
+    del tasks["b"]
+    storage.write(storage.snapshot(tasks))
+    # Nothing changed, nothing appended
+    storage.write(storage.snapshot(tasks))
+
+    ops = [(line["op"], line.get("id")) for line in _journal_lines(path)]
+    assert ops == [("add", None), ("update", "a"), ("status", "a"), ("delete", "b")]
+
+    loaded = storage.load()
+    assert list(loaded.keys()) == ["a"]
+    assert loaded["a"].message == "A changed"
+    assert loaded["a"].status == "done"
+    assert loaded["a"].completed == tasks["a"].completed
+
+
+def test_journal_clears_fields_and_ignores_torn_line(tmp_path):
+    """Test that fields set to None are removed and a torn write is skipped."""
+    path = tmp_path / "todos.journal"
+    storage = JournalStorage(path)
+    tasks = TaskList()
+    tasks["a"] = Task(id="a", message="A", status="in-progress", started=datetime.now())
+    storage.write(storage.snapshot(tasks))
+
+    tasks = storage.load()
+    tasks["a"].status = "pending"
+    tasks["a"].started = None
+    storage.write(storage.snapshot(tasks))
+    with open(path, "a") as f:
+        f.write('{"op": "delete", "i')
+
+    loaded = storage.load()
+    assert loaded["a"].status == "pending"
+    assert loaded["a"].started is None
+
+
+def test_journal_compaction(tmp_path, monkeypatch):
+    """Test that a large journal is folded into the snapshot."""
+    monkeypatch.setattr("dependent_todos.journal.JOURNAL_COMPACT_MIN_BYTES", 0)
+    path = tmp_path / "todos.journal"
+    storage = JournalStorage(path)
+    tasks = TaskList()
+    tasks["a"] = Task(id="a", message="A")
+    storage.write(storage.snapshot(tasks))
+
+    for i in range(20):
+        tasks["a"].message = f"A {i} " + "x" * 50
+        storage.write(storage.snapshot(tasks))
+        # Never much larger than the snapshot
+        assert path.stat().st_size <= 2 * storage.snapshot_path.stat().st_size
+
+    assert storage.load()["a"].message == "A 19 " + "x" * 50
+
+
+def test_sqlite_round_trip_and_updates(tmp_path):
+    """Test that the database keeps order, fields and dependency edges."""
+    storage = SqliteStorage(tmp_path / "todos.db")
+    assert len(storage.load()) == 0
+    # Reading a missing database does not create it
+    assert not storage.file_path.exists()
+    tasks = TaskList()
+    tasks["b"] = Task(id="b", message="B")
+    tasks["a"] = Task(id="a", message="A", dependencies=["b"])
+    tasks["c"] = Task(id="c", message="C", dependencies=["b", "a"])
+    storage.write(storage.snapshot(tasks))
+
+    tasks = storage.load()
+    assert list(tasks.keys()) == ["b", "a", "c"]
+    assert tasks["c"].dependencies == ["b", "a"]
+
+    kind, statements = storage.snapshot(tasks)
+    assert (kind, statements) == ("update", [])
+    tasks.mark_done("b")
+    kind, statements = storage.snapshot(tasks)
+    assert kind == "update"
+    assert len(statements) == 1
+    storage.write((kind, statements))
+
+    tasks["c"].dependencies = ["a"]
+    tasks["d"] = Task(id="d", message="D", dependencies=["c"])
+    del tasks["a"]
+    storage.write(storage.snapshot(tasks))
+
+    loaded = storage.load()
+    assert list(loaded.keys()) == ["b", "c", "d"]
+    assert loaded["b"].status == "done"
+    assert loaded["b"].completed == tasks["b"].completed
+    assert loaded["c"].dependencies == ["a"]
+    assert storage.task_ids_with_status("pending") == ["c", "d"]
+    assert storage.get_dependents("c") == ["d"]
+    assert storage.get_dependents("a") == ["c"]
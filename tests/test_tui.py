@@ -10,6 +10,7 @@ from dependent_todos.tui import (
     DependentTodosApp,
     FocusableTabs,
     TaskTable,
+    VirtualTaskTable,
     TaskDetails,
     DeleteTaskModal,
     UpdateTaskModal,
@@ -297,6 +298,123 @@ async def test_mark_done_key(temp_dir):
         assert (datetime.now() - task.completed).total_seconds() < 1
 
 
+@pytest.mark.asyncio
+async def test_table_updates_changed_rows_only(temp_dir):
+    """Test that refreshing the table reconciles rows by task id."""
+    app = DependentTodosApp()
+    async with app.run_test() as pilot:
+        app.tasks = TaskList(
+            root={
+                "task1": create_sample_task("task1", "Task 1"),
+                "task2": create_sample_task("task2", "Task 2", dependencies=["task1"]),
+                "task3": create_sample_task("task3", "Task 3"),
+            }
+        )
+        table = cast(TaskTable, pilot.app.task_table)
+        table.filter_state = "Pending"
+        table.refresh_data(app.tasks)
+        assert [row.key.value for row in table.ordered_rows] == [
+            "task3",
+            "task2",
+            "task1",
+        ]
+        table.move_cursor(row=1)
+        task3_row = table.rows["task3"]
+
+        app.tasks.mark_done("task1")
+        table.refresh_data(app.tasks)
+
+        # The done task is removed, the others keep their rows
+        assert [row.key.value for row in table.ordered_rows] == ["task3", "task2"]
+        assert table.rows["task3"] is task3_row
+        assert "blocked" not in str(table.get_cell("task2", "status"))
+        # The cursor stays on the highlighted task
+        assert table.cursor_row == 1
+
+        # A new task is inserted at its sorted position
+        app.tasks["task4"] = create_sample_task("task4", "Task 4")
+        table.refresh_data(app.tasks)
+        assert [row.key.value for row in table.ordered_rows] == [
+            "task4",
+            "task3",
+            "task2",
+        ]
+        assert table.coordinate_to_cell_key(table.cursor_coordinate).row_key == "task2"
+
+
+@pytest.mark.asyncio
+async def test_save_keeps_tasks_in_memory(temp_dir):
+    """Test that saving does not reload the file, refresh only reloads changes."""
+    app = DependentTodosApp()
+    async with app.run_test() as pilot:
+        tasks = TaskList(root={"task1": create_sample_task("task1", "Task 1")})
+        app.tasks = tasks
+        app.current_task_id = "task1"
+        await pilot.press("m")
+        assert app.tasks is tasks
+
+        # Refreshing writes pending changes and keeps the in-memory tasks
+        await pilot.press("r")
+        assert app.tasks is tasks
+        assert app.config_path.exists()
+
+        # A change on disk is merged into the in-memory tasks on refresh
+        changed = TaskList(root={"task2": create_sample_task("task2", "Task 2")})
+        changed.save_to_file(app.config_path)
+        await pilot.press("r")
+        assert app.tasks is tasks
+        assert list(app.tasks.keys()) == ["task2"]
+
+
+@pytest.mark.asyncio
+async def test_pending_save_flushed_on_exit(temp_dir):
+    """Test that changes are written when the app exits before the save delay."""
+    app = DependentTodosApp()
+    app.SAVE_DELAY = 60
+    async with app.run_test() as pilot:
+        app.tasks = TaskList(root={"task1": create_sample_task("task1", "Task 1")})
+        app.current_task_id = "task1"
+        await pilot.press("m")
+        assert not app.config_path.exists()
+
+    assert TaskList.load_from_file(app.config_path)["task1"].status == "done"
+
+
+@pytest.mark.asyncio
+async def test_external_file_change_is_merged(temp_dir):
+    """Test that the watcher merges changes written by another process."""
+    app = DependentTodosApp()
+    async with app.run_test() as pilot:
+        tasks = TaskList(
+            root={
+                "task1": create_sample_task("task1", "Task 1"),
+                "task2": create_sample_task("task2", "Task 2", dependencies=["task1"]),
+            }
+        )
+        app.tasks = tasks
+        app.current_task_id = "task2"
+        await pilot.press("m", "r")
+        table = cast(TaskTable, pilot.app.task_table)
+        table.filter_state = "Pending"
+        table.refresh_data(app.tasks)
+        task1_row = table.rows["task1"]
+
+        external = TaskList.load_from_file(app.config_path)
+        external["task3"] = create_sample_task("task3", "Task 3")
+        external["task1"].message = "Task 1 edited elsewhere"
+        external.save_to_file(app.config_path)
+
+        for _ in range(50):
+            await pilot.pause(0.1)
+            if "task3" in app.tasks:
+                break
+        assert app.tasks is tasks
+        assert app.tasks["task1"].message == "Task 1 edited elsewhere"
+        assert table.rows["task1"] is task1_row
+        assert table.get_cell("task1", "message") == "Task 1 edited elsewhere"
+        assert "task3" in table.rows
+
+
 @pytest.mark.asyncio
 async def test_topological_order_key(temp_dir):
     """Test the topological order key."""
@@ -552,6 +670,42 @@ async def test_tree_node_selection_updates_current_task(temp_dir):
         assert tree.root_task_id == "task1"
 
 
+@pytest.mark.asyncio
+async def test_tree_nodes_created_on_expand(temp_dir):
+    """Test that dependency nodes are only created for expanded tree nodes."""
+    app = DependentTodosApp()
+    async with app.run_test() as pilot:
+        app.tasks = TaskList(
+            root={
+                "task1": create_sample_task("task1", "Task 1"),
+                "task2": create_sample_task("task2", "Task 2", dependencies=["task1"]),
+                "task3": create_sample_task("task3", "Task 3", dependencies=["task2"]),
+            }
+        )
+        tree = pilot.app.dep_tree
+        tree.tasks = app.tasks
+        tree.root_task_id = "task3"
+        tree._build_tree()
+
+        # Only the selected task is expanded, its dependency is not populated
+        (task3_node,) = tree.root.children
+        assert task3_node.is_expanded
+        (task2_node,) = task3_node.children
+        assert task2_node.data == "task2"
+        assert task2_node.allow_expand
+        assert not task2_node.is_expanded
+        assert not task2_node.children
+
+        task2_node.expand()
+        await pilot.pause()
+        assert [child.data for child in task2_node.children] == ["task1"]
+        assert not task2_node.children[0].allow_expand
+
+        task2_node.collapse()
+        await pilot.pause()
+        assert not task2_node.children
+
+
 # TODO: add to test_tree_sidebar
 @pytest.mark.asyncio
 async def test_tab_switch_clears_tree(temp_dir):
@@ -666,3 +820,100 @@ async def test_update_modal_includes_done_dependencies(temp_dir):
         assert "task3" not in selection_list.selected
 
         await pilot.press("escape")
+
+
+@pytest.mark.asyncio
+async def test_sort_by_column_header(temp_dir):
+    """Test that clicking a header sorts by it and toggles the direction."""
+    app = DependentTodosApp()
+    async with app.run_test() as pilot:
+        app.tasks = TaskList(
+            root={
+                "task-b": create_sample_task(
+                    "task-b", "B", started=datetime(2024, 1, 2)
+                ),
+                "task-a": create_sample_task("task-a", "A"),
+                "task-c": create_sample_task(
+                    "task-c", "C", started=datetime(2024, 1, 1)
+                ),
+            }
+        )
+        table = cast(TaskTable, pilot.app.task_table)
+        table.filter_state = "Pending"
+        table.refresh_data(app.tasks)
+
+        await pilot.click(TaskTable, offset=(2, 0))
+        await pilot.pause()
+        assert [row.key.value for row in table.ordered_rows] == [
+            "task-a",
+            "task-b",
+            "task-c",
+        ]
+        await pilot.click(TaskTable, offset=(2, 0))
+        await pilot.pause()
+        assert [row.key.value for row in table.ordered_rows] == [
+            "task-c",
+            "task-b",
+            "task-a",
+        ]
+
+        # Fields without a column are reached by cycling, None sorts last
+        table.sort_field = "created"
+        table.action_cycle_sort()
+        assert table.sort_field == "started"
+        assert [row.key.value for row in table.ordered_rows] == [
+            "task-c",
+            "task-b",
+            "task-a",
+        ]
+        table.set_sort("started")
+        assert [row.key.value for row in table.ordered_rows] == [
+            "task-b",
+            "task-c",
+            "task-a",
+        ]
+
+
+@pytest.mark.asyncio
+async def test_virtual_table(temp_dir):
+    """Test that the virtualized table only formats the rows it shows."""
+    app = DependentTodosApp(virtual_table=True)
+    async with app.run_test(size=(120, 40)) as pilot:
+        app.tasks = TaskList(
+            root={
+                f"task-{i:04}": create_sample_task(
+                    f"task-{i:04}",
+                    f"Task {i}",
+                    status="done",
+                    completed=datetime(2024, 1, 1),
+                )
+                for i in range(2000)
+            }
+        )
+        table = cast(VirtualTaskTable, pilot.app.task_table)
+        assert isinstance(table, VirtualTaskTable)
+        table.filter_state = "Done"
+        table.sort_field = "id"
+        table.sort_reverse = False
+        table.refresh_data(app.tasks)
+        await pilot.pause()
+
+        assert len(table.task_ids) == 2000
+        assert len(table._row_cache) < 100
+        assert app.current_task_id == "task-0000"
+
+        table.focus()
+        await pilot.press("down", "down")
+        assert app.current_task_id == "task-0002"
+        await pilot.press("end")
+        await pilot.pause()
+        assert app.current_task_id == "task-1999"
+        assert table.scroll_y > 0
+        assert len(table._row_cache) < 200
+
+        # Clicking the ID header toggles the direction, the cursor stays
+        await pilot.click(VirtualTaskTable, offset=(2, 0))
+        await pilot.pause()
+        assert table.task_ids[0] == "task-1999"
+        assert table.cursor_row == 0
+        assert app.current_task_id == "task-1999"
@@ -1,6 +1,8 @@
 """Tests for utility functions."""
 
-from dependent_todos.utils import generate_unique_id, slugify
+import pytest
+
+from dependent_todos.utils import atomic_write, generate_unique_id, slugify
 
 
 class TestSlugify:
@@ -104,3 +106,33 @@ class TestGenerateUniqueId:
         existing = {"test"}
         result = generate_unique_id("test", existing)
         assert result == "test-1"
+
+
+class TestAtomicWrite:
+    """Test atomic_write function."""
+
+    def test_replaces_content_and_keeps_mode(self, tmp_path):
+        """Test that the file is replaced without leftovers and keeps its mode."""
+        path = tmp_path / "todos.toml"
+        path.write_bytes(b"old")
+        path.chmod(0o600)
+        atomic_write(path, b"new")
+        assert path.read_bytes() == b"new"
+        assert path.stat().st_mode & 0o777 == 0o600
+        assert [p.name for p in tmp_path.iterdir()] == ["todos.toml"]
+
+    def test_new_file_respects_umask(self, tmp_path, monkeypatch):
+        """Test that a new file gets the mode open() would give it."""
+        monkeypatch.setattr("dependent_todos.utils.UMASK", 0o077)
+        path = tmp_path / "todos.toml"
+        atomic_write(path, b"new")
+        assert path.stat().st_mode & 0o777 == 0o600
+
+    def test_failed_write_keeps_old_content(self, tmp_path):
+        """Test that a failing write leaves the original file untouched."""
+        path = tmp_path / "todos.toml"
+        path.write_bytes(b"old")
+        with pytest.raises(TypeError):
+            atomic_write(path, "not bytes")  # type: ignore[arg-type]
+        assert path.read_bytes() == b"old"
+        assert [p.name for p in tmp_path.iterdir()] == ["todos.toml"]
@@ -0,0 +1,79 @@
+"""Tests for watching the todos file."""
+
+import threading
+
+import pytest
+
+from dependent_todos.watcher import FileWatcher
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_file_watcher_reports_changes(tmp_path, use_inotify):
+    """Test that a burst of writes is reported once with the final signature."""
+    path = tmp_path / "todos.toml"
+    path.write_text("")
+    changes = []
+    changed = threading.Event()
+
+    def on_change(signature):
+        changes.append(signature)
+        changed.set()
+
+    watcher = FileWatcher(
+        path, on_change, debounce=0.2, poll_interval=0.05, use_inotify=use_inotify
+    )
+    watcher.start()
+    try:
+        for i in range(3):
+            path.write_text(f"# change {i}\n")
+        assert changed.wait(5)
+        # Give a wrongly split burst the chance to be reported a second time
+        changed.clear()
+        assert not changed.wait(0.5)
+    finally:
+        watcher.stop()
+
+    stat = path.stat()
+    assert changes == [(stat.st_mtime_ns, stat.st_size)]
+
+
+def test_file_watcher_ignores_other_files(tmp_path):
+    """Test that changes to other files in the directory are not reported."""
+    path = tmp_path / "todos.toml"
+    changed = threading.Event()
+    watcher = FileWatcher(path, lambda signature: changed.set(), debounce=0.05)
+    watcher.start()
+    try:
+        (tmp_path / "other.toml").write_text("")
+        assert not changed.wait(0.5)
+        path.write_text("")
+        assert changed.wait(5)
+    finally:
+        watcher.stop()
+
+
+def test_file_watcher_survives_callback_errors(tmp_path):
+    """Test that an exception in the callback is reported and watching goes on."""
+    path = tmp_path / "todos.toml"
+    errors = []
+    calls = []
+    changed = threading.Event()
+
+    def on_change(signature):
+        calls.append(signature)
+        changed.set()
+        if len(calls) == 1:
+            raise RuntimeError("parse failed")
+
+    watcher = FileWatcher(path, on_change, debounce=0.05, on_error=errors.append)
+    watcher.start()
+    try:
+        path.write_text("first")
+        assert changed.wait(5)
+        changed.clear()
+        path.write_text("second change")
+        assert changed.wait(5)
+    finally:
+        watcher.stop()
+    assert len(calls) == 2
+    assert [str(e) for e in errors] == ["parse failed"]